@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Offline throughput test for the fact-check fan-out.
+
+Starts a local stand-in fact-check API with a simulated latency and sends
+it a batch of claims, first one request at a time (the old behaviour)
+and then through FactCheckClient. The second client run shows the effect
+of the shared verdict cache.
+
+Usage: python benchmark_fact_check.py [--claims 40] [--latency 0.1]
+                                      [--per-host 8] [--serve]
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from src.utils.fact_check_client import FactCheckClient, VerdictCache
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled connections are reused
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+    latency = 0.1
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        query = parse_qs(urlsplit(self.path).query).get("query", [""])[0]
+        body = json.dumps({"claim": query, "rating": "unverified", "source": self.path.split("?")[0]})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode("utf-8"))
+
+    def log_message(self, format, *args):
+        pass
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # the default backlog of 5 drops bursts of new connections
+
+def start_server(latency: float, port: int = 0) -> ThreadingHTTPServer:
+    StandInHandler.latency = latency
+    server = StandInServer(("127.0.0.1", port), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def serial_check(apis, claims) -> float:
+    """The previous implementation: one blocking request per claim and API"""
+    import urllib.request
+    from urllib.parse import urlencode
+    started = time.perf_counter()
+    for claim in claims:
+        for url in apis.values():
+            with urllib.request.urlopen(f"{url}?{urlencode({'query': claim})}", timeout=30) as response:
+                json.loads(response.read())
+    return time.perf_counter() - started
+
+async def fan_out_check(apis, claims, per_host: int):
+    client = FactCheckClient(apis, max_per_host=per_host, cache=VerdictCache())
+    try:
+        started = time.perf_counter()
+        first = await client.check(claims)
+        cold = time.perf_counter() - started
+        # Client stats are cumulative; report the cold run only
+        cold_stats = dict(client.stats)
+        started = time.perf_counter()
+        await client.check(claims)
+        warm = time.perf_counter() - started
+    finally:
+        await client.aclose()
+    return cold, warm, first, cold_stats
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--claims", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds per stand-in response")
+    parser.add_argument("--per-host", type=int, default=8)
+    parser.add_argument("--serve", action="store_true", help="only run the stand-in server on port 8765")
+    args = parser.parse_args()
+
+    if args.serve:
+        server = start_server(args.latency, 8765)
+        print("Stand-in fact-check API on http://127.0.0.1:8765/<source>?query=...")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+        return
+
+    server = start_server(args.latency)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    apis = {"snopes": f"{base}/snopes", "politifact": f"{base}/politifact"}
+    # Every fourth claim repeats an earlier one with different casing
+    claims = [
+        f"Entity {i // 4}".upper() if i % 4 == 3 else f"Entity {i}"
+        for i in range(args.claims)
+    ]
+
+    serial = serial_check(apis, claims)
+    cold, warm, results, stats = asyncio.run(fan_out_check(apis, claims, args.per_host))
+    server.shutdown()
+
+    calls = len(claims) * len(apis)
+    print(f"claims: {len(claims)}  apis: {len(apis)}  latency: {args.latency * 1000:.0f} ms")
+    print(f"serial:         {serial:7.2f}s  ({calls / serial:7.1f} calls/s)")
+    print(f"fan-out (cold): {cold:7.2f}s  ({calls / cold:7.1f} calls/s, {stats['requests']} requests, "
+          f"{stats['deduplicated']} duplicate claims skipped)")
+    print(f"fan-out (warm): {warm:7.2f}s  (served from the verdict cache)")
+    print(f"claims with verdicts: {len(results)}")
+
+if __name__ == "__main__":
+    main()
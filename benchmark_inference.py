@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark local inference backends (int8, onnx) against fp32.
+Reports per-call latency, batched throughput, output drift and (for int8)
+the number of layers actually quantized, for the pipelines used by
+HuggingFaceModel and EngagingContentAgent.
+
+Usage: python benchmark_inference.py [--tasks text-generation summarization]
+                                     [--backends int8 onnx] [--runs 10]
+"""
+import argparse
+import statistics
+import time
+from src.models.inference_backends import load_pipeline
+
+SAMPLES = [
+    "Artificial intelligence is changing how hospitals triage patients and schedule staff.",
+    "Remote work has reshaped commercial real estate markets across major cities.",
+    "Renewable energy adoption accelerated as battery storage costs continued to fall.",
+    "Small businesses increasingly rely on social media for customer acquisition.",
+]
+
+TASKS = {
+    "text-generation": {"model": "distilgpt2", "kwargs": {"max_new_tokens": 40, "do_sample": False}},
+    "sentiment-analysis": {"model": None, "kwargs": {}},
+    "summarization": {"model": None, "kwargs": {"max_length": 40, "min_length": 10, "do_sample": False}},
+}
+
+def _text(output) -> str:
+    if isinstance(output, list):
+        output = output[0]
+    for field in ("generated_text", "summary_text", "label"):
+        if field in output:
+            return str(output[field])
+    return str(output)
+
+def _drift(reference: str, candidate: str) -> float:
+    """1 - token-level Jaccard similarity (0.0 means identical output)"""
+    ref, cand = set(reference.split()), set(candidate.split())
+    if not ref and not cand:
+        return 0.0
+    return 1 - len(ref & cand) / len(ref | cand)
+
+def benchmark(task: str, backend: str, runs: int):
+    spec = TASKS[task]
+    started = time.perf_counter()
+    pipe = load_pipeline(task, spec["model"], backend=backend)
+    load_seconds = time.perf_counter() - started
+    if pipe.tokenizer.pad_token_id is None:
+        # GPT-2 style tokenizers need a pad token for batched calls
+        pipe.tokenizer.pad_token_id = pipe.model.config.eos_token_id
+
+    pipe(SAMPLES[0], **spec["kwargs"])  # warm-up
+    latencies = []
+    outputs = []
+    for i in range(runs):
+        sample = SAMPLES[i % len(SAMPLES)]
+        started = time.perf_counter()
+        output = pipe(sample, **spec["kwargs"])
+        latencies.append(time.perf_counter() - started)
+        if i < len(SAMPLES):
+            outputs.append(_text(output))
+
+    started = time.perf_counter()
+    pipe(SAMPLES * 2, batch_size=len(SAMPLES), **spec["kwargs"])
+    throughput = len(SAMPLES) * 2 / (time.perf_counter() - started)
+
+    latencies.sort()
+    return {
+        "load_s": load_seconds,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+        "items_per_s": throughput,
+        "outputs": outputs,
+        "quantized": getattr(pipe.model, "quantized_modules", None),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", nargs="+", default=list(TASKS), choices=list(TASKS))
+    parser.add_argument("--backends", nargs="+", default=["int8", "onnx"], choices=["int8", "onnx"])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'task':<20}{'backend':<9}{'load s':>8}{'p50 ms':>9}{'p95 ms':>9}{'items/s':>9}{'drift':>7}{'q-layers':>9}")
+    for task in args.tasks:
+        baseline = benchmark(task, "fp32", args.runs)
+        results = [("fp32", baseline)]
+        for backend in args.backends:
+            try:
+                results.append((backend, benchmark(task, backend, args.runs)))
+            except Exception as e:
+                print(f"{task:<20}{backend:<9} failed: {e}")
+
+        for backend, result in results:
+            drift = statistics.mean(
+                _drift(ref, cand) for ref, cand in zip(baseline["outputs"], result["outputs"])
+            )
+            quantized = "-" if result["quantized"] is None else result["quantized"]
+            print(
+                f"{task:<20}{backend:<9}{result['load_s']:>8.1f}{result['p50_ms']:>9.1f}"
+                f"{result['p95_ms']:>9.1f}{result['items_per_s']:>9.2f}{drift:>7.3f}{quantized:>9}"
+            )
+
+if __name__ == "__main__":
+    main()
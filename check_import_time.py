@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for worker startup.
+Prints how long importing the content engine takes and fails if it is
+over IMPORT_BUDGET_SECONDS or pulls in heavy ML/visualisation libraries.
+The measurement lives in src/utils/import_profile.py and
+tests/test_import_time.py runs the same check with pytest.
+"""
+import sys
+from src.utils.import_profile import BUDGET_SECONDS, MODULE, import_profile
+
+def main():
+    seconds, heavy = import_profile()
+    print(f"import {MODULE}: {seconds:.3f}s (budget {BUDGET_SECONDS:.3f}s)")
+    if heavy:
+        print(f"Heavy modules imported eagerly: {','.join(heavy)}")
+    return 1 if heavy or seconds > BUDGET_SECONDS else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
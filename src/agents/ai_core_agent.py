@@ -1,7 +1,13 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from src.agents.base_agent import BaseAgent
 import asyncio
+import logging
 from datetime import datetime
+from src.models.structured_output import OutputSchema, StructuredOutput
+
+logger = logging.getLogger(__name__)
+
+FUSED_SCHEMA = OutputSchema("fused_analysis", {"intent": dict, "entities": list, "semantics": dict})
 
 class AICore:
     """Core AI capabilities for advanced text processing"""
@@ -31,24 +37,88 @@ class AICore:
 class AICorePipeline:
     """Processing pipeline for AI operations"""
     
-    def __init__(self, model):
+    def __init__(self, model, fused: bool = True):
         self.model = model
         self.core = AICore()
+        self.fused_output = StructuredOutput(FUSED_SCHEMA, "ai_core")
+        self.fused = fused
         
     async def process_text(self, text: str, task_type: str) -> Dict[str, Any]:
         """Process text through the AI pipeline"""
-        # Implement pipeline stages
-        intent = await self.analyze_intent(text)
-        entities = await self.extract_entities(text)
-        semantics = await self.analyze_semantics(text)
+        analysis = await self.analyze_fused(text) if self.fused else None
+        if analysis is None:
+            # Run the pipeline stages concurrently
+            intent, entities, semantics = await asyncio.gather(
+                self.analyze_intent(text),
+                self.extract_entities(text),
+                self.analyze_semantics(text)
+            )
+            analysis = {
+                "intent": intent,
+                "entities": entities,
+                "semantics": semantics
+            }
         
         return {
-            "intent": intent,
-            "entities": entities,
-            "semantics": semantics,
+            **analysis,
             "task_type": task_type
         }
     
+    async def analyze_fused(self, text: str) -> Optional[Dict[str, Any]]:
+        """Run intent, entity and semantic analysis in a single request.
+
+        Returns None when the response is not valid JSON of the expected
+        shape, so the caller can fall back to separate requests.
+        """
+        prompt = f"""
+        Analyze this text:
+        {text}
+        
+        Respond with ONLY a JSON object in this exact format:
+        {{
+          "intent": {{
+            "primary_goal": "...",
+            "secondary_objectives": ["..."],
+            "user_expectations": ["..."],
+            "action_type": "..."
+          }},
+          "entities": [
+            {{"text": "...", "type": "person|organization|location|date|technical_term|concept"}}
+          ],
+          "semantics": {{
+            "main_themes": ["..."],
+            "key_relationships": ["..."],
+            "contextual_meaning": "...",
+            "conceptual_framework": "..."
+          }}
+        }}
+        """
+        try:
+            response = await self.model.generate_content(prompt, json_mode=True)
+        except Exception as e:
+            logger.warning(f"Fused analysis failed: {e}")
+            return None
+        
+        analysis = self._parse_fused(response)
+        if analysis is None:
+            logger.warning("Fused analysis returned invalid JSON, falling back to separate requests")
+        return analysis
+    
+    def _parse_fused(self, response: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Parse and validate a fused analysis response"""
+        if not response:
+            return None
+        
+        parsed = self.fused_output.parse(response)
+        if parsed is None or not parsed["intent"] or not parsed["semantics"]:
+            return None
+        
+        return {
+            "intent": parsed["intent"],
+            "entities": parsed["entities"],
+            "semantics": parsed["semantics"]
+        }
+    
     async def analyze_intent(self, text: str) -> Dict[str, Any]:
         prompt = f"""
         Analyze the intent of this text:
@@ -1,6 +1,9 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from src.agents.base_agent import BaseAgent
+import asyncio
 import logging
+import re
+import time
 from src.models.gemini_model import GeminiModel
 from src.models.huggingface_model import HuggingFaceModel
 from src.utils.fact_checker import FactChecker
@@ -20,26 +23,65 @@ if not logger.handlers:
     handler.setFormatter(formatter)
     logger.addHandler(handler)
 
+HEADING_START = re.compile(r"(?m)^(?=#{1,6}\s)")
+PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n\s*")
+
+# Rough size of a token in English text, used only for savings metrics
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text: Optional[str]) -> int:
+    return len(text or "") // CHARS_PER_TOKEN
+
+def split_sections(content: str) -> List[str]:
+    """Split an article at markdown headings, or at paragraphs if it has none.
+
+    Joining the sections gives back the original text.
+    """
+    sections = [section for section in HEADING_START.split(content) if section]
+    if len(sections) > 1:
+        return sections
+    cuts = [match.end() for match in PARAGRAPH_BREAK.finditer(content)]
+    bounds = [0] + [cut for cut in cuts if cut < len(content)] + [len(content)]
+    return [content[start:end] for start, end in zip(bounds, bounds[1:]) if end > start]
+
 class ArticleAgent(BaseAgent):
-    def __init__(self, gemini_model: GeminiModel, hf_model_name: str, fact_checker: FactChecker):
+    def __init__(self, gemini_model: GeminiModel, hf_model_name: str, fact_checker: FactChecker,
+                 max_section_retries: int = 2):
         self.gemini_model = gemini_model
         self.hf_model = HuggingFaceModel(hf_model_name)
         self.fact_checker = fact_checker
         self.verification_agent = VerificationAgent()
         self.engaging_content_agent = EngagingContentAgent()
         self.visual_generator = VisualGeneratorAgent()
+        # Rounds of section regeneration before the article is accepted as is
+        self.max_section_retries = max_section_retries
+        self.stats = {
+            "section_regenerations": 0,
+            "full_regenerations_avoided": 0,
+            "tokens_saved": 0,
+            "seconds_saved": 0.0
+        }
     
     async def ensure_high_quality(self, content: str) -> bool:
         # Implement checks for quality metrics (e.g., readability, factual accuracy)
         return len(content) > 100  # Example check: content length must be greater than 100 characters
 
     async def validate_content(self, content: str) -> bool:
-        # Check each statement in the content
-        statements = content.split('. ')  # Simple split for example
-        for statement in statements:
-            if not self.fact_checker.check_fact(statement):
-                return False
-        return True
+        return not self.failing_sections(split_sections(content))
+
+    def failing_sections(self, sections: List[str]) -> List[int]:
+        """Indexes of the sections with a statement that fails the fact check"""
+        # Check each statement of every section in one pass
+        statements, owners = [], []
+        for index, section in enumerate(sections):
+            for statement in section.strip().split('. '):  # Simple split for example
+                statements.append(statement)
+                owners.append(index)
+        failing = {
+            owner for owner, passed in zip(owners, self.fact_checker.check_facts(statements))
+            if not passed
+        }
+        return sorted(failing)
 
     async def process_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         try:
@@ -68,6 +110,7 @@ class ArticleAgent(BaseAgent):
             """
 
             # Generate and improve content
+            started = time.perf_counter()
             content = await self.gemini_model.generate_content(prompt)
             if not content:
                 raise ValueError("Failed to generate content")
@@ -76,13 +119,19 @@ class ArticleAgent(BaseAgent):
             if not improved_content:
                 raise ValueError("Failed to improve content")
 
-            # Validate content
-            if not await self.validate_content(improved_content):
-                logger.warning("Content validation failed. Regenerating content...")
-                return await self.process_request(request)
+            # Validate content, regenerating only the sections that fail
+            sections = split_sections(improved_content)
+            failing = self.failing_sections(sections)
+            full_pass = {
+                "seconds": time.perf_counter() - started,
+                "tokens": (estimate_tokens(prompt) + 2 * estimate_tokens(content)
+                           + estimate_tokens(improved_content))
+            }
+            regeneration = await self._regenerate_sections(topic, sections, failing, full_pass)
+            improved_content = "".join(sections)
 
             # After generating the content, verify it
-            verification_results = self.verification_agent.verify_article(improved_content)
+            verification_results = await self.verification_agent.verify_article(improved_content)
             
             # Handle flagged claims and bias analysis
             flagged_claims = verification_results['fact_check_results']
@@ -131,6 +180,7 @@ class ArticleAgent(BaseAgent):
                 "interactive_elements": visuals['interactive_elements'],
                 "analysis": enhancement_results['analysis'],
                 "verification_results": verification_results,
+                "regeneration": regeneration,
                 "metadata": {
                     **request.get('metadata', {}),
                     "article_type": "blog_post",
@@ -142,6 +192,75 @@ class ArticleAgent(BaseAgent):
             logger.error(f"ArticleAgent error: {str(e)}")
             raise
 
+    async def _regenerate_sections(self, topic: str, sections: List[str], failing: List[int],
+                                   full_pass: Dict[str, float]) -> Dict[str, Any]:
+        """Rewrite failing sections in place, at most max_section_retries rounds.
+
+        Each round rewrites the failing sections concurrently with the passing
+        ones as context, then re-validates only the rewritten sections. Savings
+        are measured against regenerating the whole article once per round.
+        """
+        report = {"rounds": 0, "regenerated_sections": 0, "failing_sections": failing,
+                  "tokens_saved": 0, "seconds_saved": 0.0}
+        while failing and report["rounds"] < self.max_section_retries:
+            report["rounds"] += 1
+            logger.warning(
+                f"Content validation failed for {len(failing)} of {len(sections)} sections. "
+                f"Regenerating them (round {report['rounds']}/{self.max_section_retries})..."
+            )
+            started = time.perf_counter()
+            context = "".join(section for index, section in enumerate(sections) if index not in failing)
+            rewrites = await asyncio.gather(*(
+                self._regenerate_section(topic, sections[index], context) for index in failing
+            ))
+            tokens = 0
+            for index, (rewritten, used_tokens) in zip(failing, rewrites):
+                tokens += used_tokens
+                if rewritten:
+                    # Keep the separator that followed the old section
+                    trailing = sections[index][len(sections[index].rstrip()):]
+                    sections[index] = rewritten.strip() + (trailing or "\n\n")
+            rechecked = self.failing_sections([sections[index] for index in failing])
+            failing = [failing[position] for position in rechecked]
+
+            seconds = time.perf_counter() - started
+            report["regenerated_sections"] += len(rewrites)
+            report["tokens_saved"] += full_pass["tokens"] - tokens
+            report["seconds_saved"] += full_pass["seconds"] - seconds
+            self.stats["section_regenerations"] += len(rewrites)
+            self.stats["full_regenerations_avoided"] += 1
+            self.stats["tokens_saved"] += full_pass["tokens"] - tokens
+            self.stats["seconds_saved"] += full_pass["seconds"] - seconds
+
+        if failing:
+            logger.warning(f"{len(failing)} sections still fail validation after "
+                           f"{report['rounds']} regeneration rounds; keeping them")
+        report["failing_sections"] = failing
+        return report
+
+    async def _regenerate_section(self, topic: str, section: str, context: str):
+        """Returns (rewritten section or None, estimated tokens spent)"""
+        prompt = f"""
+        Rewrite one section of a blog post about: {topic}
+
+        The rest of the article, which must stay consistent with it:
+        {context}
+
+        Section to rewrite:
+        {section}
+
+        Keep its heading, if any. Support each statement with evidence,
+        e.g. "research shows" or "according to" a named source.
+        Return only the rewritten section.
+        """
+        draft = await self.gemini_model.generate_content(prompt)
+        tokens = estimate_tokens(prompt) + estimate_tokens(draft)
+        if not draft:
+            return None, tokens
+        improved = await self.hf_model.improve_content(draft)
+        tokens += estimate_tokens(draft) + estimate_tokens(improved)
+        return improved or draft, tokens
+
     async def _combine_seo_and_engagement(self, content: str) -> str:
         """Balance SEO optimization with readability"""
         # Implementation of SEO and engagement balance
@@ -17,4 +17,9 @@ class BaseAgent(ABC):
     
     def is_valid_response(self, response: str) -> bool:
         """Check if response is valid"""
-        return bool(response and response.strip()) 
\ No newline at end of file
+        return bool(response and response.strip())
+
+    def release_models(self):
+        """Release the shared local models this agent and its helpers leased"""
+        from src.models.model_registry import release_leases
+        release_leases(self)
\ No newline at end of file
@@ -1,9 +1,10 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List
 from src.agents.base_agent import BaseAgent
 import asyncio
 from datetime import datetime
 import json
 from src.utils.logger import logger
+from src.models.structured_output import OutputSchema, StructuredOutput
 
 class ContentOptimizer:
     """Advanced content optimization with Claude-like principles"""
@@ -98,27 +99,11 @@ class ContentStructurer:
         """
         
         try:
-            response = await self.model.generate_content(prompt)
-            if not response:
-                return default_outline
-                
-            # Clean and parse response
-            response_text = str(response).strip()
-            # Remove any markdown or code block markers
-            response_text = response_text.replace('```json', '').replace('```', '')
-            
-            try:
-                # Try to parse the entire response first
-                return json.loads(response_text)
-            except json.JSONDecodeError:
-                # Try to extract JSON if full parse fails
-                start = response_text.find('{')
-                end = response_text.rfind('}') + 1
-                if start >= 0 and end > start:
-                    json_str = response_text[start:end]
-                    return json.loads(json_str)
-                
-            return default_outline
+            output = StructuredOutput(
+                OutputSchema("outline", {"title": str, "sections": list}, default_outline),
+                "content_structurer"
+            )
+            return await output.generate(self.model, prompt) or default_outline
             
         except Exception as e:
             logger.warning(f"Outline creation failed: {e}")
@@ -133,32 +118,6 @@ class ClaudeStyleAgent(BaseAgent):
         self.optimizer = ContentOptimizer(model)
         self.structurer = ContentStructurer(model)
         
-    def _clean_json_string(self, text: str) -> str:
-        """Clean and prepare string for JSON parsing"""
-        text = text.strip()
-        # Remove markdown code blocks
-        text = text.replace('```json', '').replace('```', '')
-        # Remove newlines and extra spaces
-        text = ' '.join(text.split())
-        return text
-        
-    def _extract_json(self, text: str) -> Optional[Dict]:
-        """Extract and parse JSON from text"""
-        try:
-            # Try direct JSON parsing first
-            return json.loads(text)
-        except json.JSONDecodeError:
-            # Try to extract JSON if embedded in text
-            try:
-                start = text.find('{')
-                end = text.rfind('}') + 1
-                if start >= 0 and end > start:
-                    json_str = text[start:end]
-                    return json.loads(json_str)
-            except:
-                return None
-        return None
-
     async def analyze_requirements(self, request: str) -> Dict[str, Any]:
         default_response = {
             "target_audience": "general",
@@ -177,21 +136,16 @@ class ClaudeStyleAgent(BaseAgent):
         """
         
         try:
-            response = await self.model.generate_content(prompt)
-            if not response:
-                return default_response
-                
-            cleaned_response = self._clean_json_string(response)
-            parsed_json = self._extract_json(cleaned_response)
-            
-            if parsed_json:
-                # Validate required fields
-                for key in default_response.keys():
-                    if key not in parsed_json:
-                        parsed_json[key] = default_response[key]
-                return parsed_json
-                
-            return default_response
+            # Missing or mistyped fields fall back to the defaults
+            output = StructuredOutput(
+                OutputSchema(
+                    "requirements",
+                    {key: type(value) for key, value in default_response.items()},
+                    default_response
+                ),
+                "claude_style"
+            )
+            return await output.generate(self.model, prompt) or default_response
             
         except Exception as e:
             logger.error(f"Requirements analysis failed: {str(e)}")
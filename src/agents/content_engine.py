@@ -35,6 +35,11 @@ class ContentEngine:
         
         self.visual_agent = VisualGeneratorAgent(config)
 
+    def release_models(self):
+        """Release the shared local models held by every agent"""
+        from src.models.model_registry import release_leases
+        release_leases(self)
+
     async def generate_content(self, topic: str, preferences: Dict[str, Any]) -> Dict[str, Any]:
         """
         Orchestrate the content creation process through all agents
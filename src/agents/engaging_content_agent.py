@@ -1,13 +1,16 @@
-from textblob import TextBlob
-from transformers import pipeline, AutoTokenizer, AutoModelForCausalLM
-import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 import logging
 from dataclasses import dataclass
 from src.agents.base_agent import BaseAgent
+from src.models.model_registry import lease_pipeline, lease_causal_lm
+from src.models.inference_executor import get_inference_executor
+from src.models.map_reduce_summarizer import MapReduceSummarizer
+from src.models.assisted_generation import AssistedGenerator
+from src.models.generation_budget import GenerationBudget, PromptTooLongError
+from src.utils.text_analytics import analyze_text
+import asyncio
 from datetime import datetime
 import ssl
-import requests
 
 # Create an SSL context that doesn't verify certificates
 ssl._create_default_https_context = ssl._create_unverified_context
@@ -20,31 +23,56 @@ class ContentStyle:
     content_type: str  # article, case_study, summary
 
 class EngagingContentAgent(BaseAgent):
-    def __init__(self, config: Any = None):
+    ASSISTED_CALL_SITES = ("tone", "complexity")
+    # Rewrites end at a run of blank lines; quiz questions end at a paragraph break
+    REWRITE_STOPS = ("\n\n\n",)
+    QUIZ_STOPS = ("\n\n",)
+
+    def __init__(self, config: Any = None, batch_size: int = 8, backend: str = None,
+                 assisted_call_sites: Optional[Iterable[str]] = None):
         self.config = config
+        self.batch_size = batch_size  # prompts per padded text-generation batch
         super().__init__()
         self.logger = logging.getLogger(__name__)
+        self.executor = get_inference_executor()
+        # Token limits for every local generation call
+        self.budget = GenerationBudget()
         
-        # Initialize transformers with SSL verification disabled
-        try:
-            self.tokenizer = AutoTokenizer.from_pretrained(
-                "gpt2",
-                trust_remote_code=True,
-                use_auth_token=False
-            )
-            self.model = AutoModelForCausalLM.from_pretrained(
-                "gpt2",
-                trust_remote_code=True,
-                use_auth_token=False
-            )
-            
-            # Initialize pipelines
-            self.sentiment_analyzer = pipeline("sentiment-analysis")
-            self.summarizer = pipeline("summarization")
-            self.text_generator = pipeline("text-generation")
-        except Exception as e:
-            self.logger.error(f"Failed to initialize models: {str(e)}")
-            raise
+        # Models are shared through the registry and loaded on first use;
+        # backend picks fp32, int8 or onnx inference for the pipelines
+        self._gpt2 = lease_causal_lm("gpt2")
+        self._sentiment_analyzer = lease_pipeline("sentiment-analysis", backend=backend)
+        self._summarizer = lease_pipeline("summarization", backend=backend)
+        self._text_generator = lease_pipeline("text-generation", backend=backend)
+        # Chunked summaries for articles longer than the summarizer's context
+        self.long_summarizer = MapReduceSummarizer(lambda: self.summarizer, batch_size=batch_size)
+        
+        # Call sites that decode with distilgpt2 drafting for gpt2
+        self.assisted_call_sites = set(assisted_call_sites or ())
+        unsupported = self.assisted_call_sites - set(self.ASSISTED_CALL_SITES)
+        if unsupported:
+            raise ValueError(f"Assisted decoding is not available for: {sorted(unsupported)}")
+        self.assisted_generator = AssistedGenerator("gpt2", "distilgpt2") if self.assisted_call_sites else None
+
+    @property
+    def tokenizer(self):
+        return self._gpt2.get()[0]
+
+    @property
+    def model(self):
+        return self._gpt2.get()[1]
+
+    @property
+    def sentiment_analyzer(self):
+        return self._sentiment_analyzer.get()
+
+    @property
+    def summarizer(self):
+        return self._summarizer.get()
+
+    @property
+    def text_generator(self):
+        return self._text_generator.get()
 
     async def process_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Process a request to enhance content"""
@@ -82,13 +110,13 @@ class EngagingContentAgent(BaseAgent):
         """Main method to enhance content engagement"""
         try:
             # Analyze current content
-            analysis = self._analyze_content(content)
+            analysis = await self._analyze_content(content)
             
             # Apply enhancements based on style
             enhanced_content = await self._apply_enhancements(content, style, analysis)
             
             # Generate interactive elements
-            interactive_elements = self._generate_interactive_elements(enhanced_content)
+            interactive_elements = await self._generate_interactive_elements(enhanced_content)
             
             return {
                 "enhanced_content": enhanced_content,
@@ -132,64 +160,77 @@ class EngagingContentAgent(BaseAgent):
         """
         
         try:
-            response = self.text_generator(
+            response = await self.executor.run(
+                self._generate_text,
                 prompt,
-                max_length=len(content) * 2,
+                call_site="complexity",
+                input_text=content,
+                stop_sequences=self.REWRITE_STOPS,
                 num_return_sequences=1,
                 temperature=0.7
             )
             return response[0]['generated_text']
+        except PromptTooLongError as e:
+            self.logger.warning(f"Skipping complexity adjustment: {str(e)}")
+            return content
         except Exception as e:
             self.logger.error(f"Complexity adjustment failed: {str(e)}")
             return content
 
-    def _analyze_content(self, content: str) -> Dict[str, Any]:
+    async def _analyze_content(self, content: str) -> Dict[str, Any]:
         """Analyze content for readability and engagement metrics"""
         try:
-            blob = TextBlob(content)
+            from textblob import TextBlob
+            emotions = asyncio.ensure_future(self.executor.run(self._analyze_emotions, content))
+            sentiment = TextBlob(content).sentiment
+            stats = analyze_text(content)
             
             return {
-                "sentiment": blob.sentiment.polarity,
-                "subjectivity": blob.sentiment.subjectivity,
-                "readability_score": self._calculate_readability(content),
-                "emotion_analysis": self._analyze_emotions(content),
-                "word_count": len(blob.words),
-                "sentence_count": len(blob.sentences)
+                "sentiment": sentiment.polarity,
+                "subjectivity": sentiment.subjectivity,
+                "readability_score": stats.flesch_reading_ease,
+                "emotion_analysis": await emotions,
+                "word_count": stats.word_count,
+                "sentence_count": stats.sentence_count
             }
         except Exception as e:
             self.logger.error(f"Content analysis failed: {str(e)}")
             return {}
 
-    def _generate_interactive_elements(self, content: str) -> Dict[str, Any]:
+    async def _generate_interactive_elements(self, content: str) -> Dict[str, Any]:
         """Generate interactive elements for enhanced engagement"""
         try:
+            # Model calls run concurrently on the inference executor
+            quiz, (summary, tldr) = await asyncio.gather(
+                self.executor.run(self._generate_quiz_questions, content),
+                self.executor.run(self._generate_summaries, content)
+            )
             return {
-                "quiz": self._generate_quiz_questions(content),
-                "summary": self._generate_summary(content),
+                "quiz": quiz,
+                "summary": summary,
                 "key_points": self._extract_key_points(content),
-                "tldr": self._generate_tldr(content)
+                "tldr": tldr
             }
         except Exception as e:
             self.logger.error(f"Interactive element generation failed: {str(e)}")
             return {}
 
-    def _generate_summary(self, content: str) -> str:
-        """Generate a concise summary of the content"""
+    def _generate_summaries(self, content: str) -> Tuple[str, str]:
+        """Generate a concise summary and a TL;DR of the content.
+
+        Both share one map pass over the article's chunks.
+        """
         try:
-            summary = self.summarizer(
-                content,
-                max_length=150,
-                min_length=50,
-                do_sample=False
-            )[0]['summary_text']
-            return summary
+            summary, tldr = self.long_summarizer.summarize_lengths(content, [(150, 50), (50, 20)])
+            return summary, tldr
         except Exception as e:
             self.logger.error(f"Summary generation failed: {str(e)}")
-            return ""
+            return "", ""
 
     def _extract_key_points(self, content: str) -> List[str]:
         """Extract key points from the content"""
         try:
+            from textblob import TextBlob
             blob = TextBlob(content)
             sentences = blob.sentences
             
@@ -229,54 +270,41 @@ class EngagingContentAgent(BaseAgent):
             return content
 
     def _calculate_readability(self, text: str) -> float:
-        """Calculate readability score using TextBlob"""
-        blob = TextBlob(text)
-        words = len(blob.words)
-        sentences = len(blob.sentences)
-        syllables = sum(self._count_syllables(word) for word in blob.words)
-        
-        # Calculate Flesch Reading Ease score
-        if sentences == 0:
-            return 0
-        return 206.835 - 1.015 * (words / sentences) - 84.6 * (syllables / words)
-
-    def _count_syllables(self, word: str) -> int:
-        """Helper method to count syllables in a word"""
-        count = 0
-        vowels = "aeiouy"
-        word = word.lower()
-        if word[0] in vowels:
-            count += 1
-        for index in range(1, len(word)):
-            if word[index] in vowels and word[index - 1] not in vowels:
-                count += 1
-        if word.endswith("e"):
-            count -= 1
-        if count == 0:
-            count += 1
-        return count
+        """Flesch Reading Ease score from the shared text analytics"""
+        return analyze_text(text).flesch_reading_ease
 
     async def _adjust_tone(self, content: str, tone: str) -> str:
         """Adjust content tone using transformer models"""
         prompt = f"Convert the following text to a {tone} tone:\n{content}"
         
-        response = self.text_generator(
-            prompt,
-            max_length=len(content) + 100,
-            num_return_sequences=1
-        )
+        try:
+            response = await self.executor.run(
+                self._generate_text,
+                prompt,
+                call_site="tone",
+                input_text=content,
+                stop_sequences=self.REWRITE_STOPS,
+                num_return_sequences=1
+            )
+        except PromptTooLongError as e:
+            # Rewriting a truncated prompt would drop the rest of the content
+            self.logger.warning(f"Skipping tone adjustment: {str(e)}")
+            return content
         
         return response[0]['generated_text']
 
     async def _add_storytelling_elements(self, content: str) -> str:
         """Add storytelling elements like analogies and case studies"""
-        # Generate analogies
+        # Generate the analogy and case study in one batch sharing one token budget
         analogy_prompt = f"Generate an analogy to explain:\n{content}"
-        analogy = self.text_generator(analogy_prompt, max_length=200)[0]['generated_text']
-        
-        # Generate case study
         case_study_prompt = f"Convert this into a case study:\n{content}"
-        case_study = self.text_generator(case_study_prompt, max_length=500)[0]['generated_text']
+        outputs = await self.executor.run(
+            self._generate_batch,
+            [analogy_prompt, case_study_prompt],
+            "storytelling",
+            input_texts=[content, content]
+        )
+        analogy, case_study = [sequences[0]['generated_text'] for sequences in outputs]
         
         return f"{content}\n\nAnalogy:\n{analogy}\n\nCase Study:\n{case_study}"
 
@@ -284,41 +312,103 @@ class EngagingContentAgent(BaseAgent):
         """Generate quiz questions from content"""
         prompt = f"Generate {num_questions} quiz questions about:\n{content}"
         
-        questions = self.text_generator(
+        questions = self._generate_text(
             prompt,
-            max_length=500,
+            task="quiz",
+            input_text=content,
+            stop_sequences=self.QUIZ_STOPS,
+            truncate=True,
             num_return_sequences=num_questions
         )
         
+        question_texts = [q['generated_text'] for q in questions]
+        options = self._generate_options_batch(question_texts)
+        
         return [
             {
-                "question": q['generated_text'],
-                "options": self._generate_options(q['generated_text']),
+                "question": question,
+                "options": question_options,
                 "correct_answer": 0  # Index of correct answer
             }
-            for q in questions
+            for question, question_options in zip(question_texts, options)
         ]
 
     def _generate_options(self, question: str) -> List[str]:
         """Generate multiple choice options for a question"""
-        prompt = f"Generate 4 options for the question:\n{question}"
+        return self._generate_options_batch([question])[0]
+
+    def _generate_options_batch(self, questions: List[str]) -> List[List[str]]:
+        """Generate multiple choice options for several questions in one batch"""
+        prompts = [f"Generate 4 options for the question:\n{question}" for question in questions]
         
-        options = self.text_generator(
-            prompt,
-            max_length=200,
+        outputs = self._generate_batch(
+            prompts,
+            "options",
+            input_texts=questions,
             num_return_sequences=4
         )
         
-        return [opt['generated_text'] for opt in options]
+        return [[opt['generated_text'] for opt in options] for options in outputs]
 
-    def _generate_tldr(self, content: str) -> str:
-        """Generate TL;DR summary"""
-        return self.summarizer(
-            content,
-            max_length=50,
-            min_length=20,
-            num_return_sequences=1
-        )[0]['summary_text']
+    def _generate_text(self, prompt: str, call_site: Optional[str] = None,
+                       task: Optional[str] = None, input_text: Optional[str] = None,
+                       stop_sequences: Optional[Iterable[str]] = None,
+                       truncate: bool = False,
+                       **generate_kwargs) -> List[Dict[str, Any]]:
+        """Run one prompt through the text generator (on an executor thread,
+        so a first-use model load does not block the event loop either).
+
+        The token budget comes from the planner for task (call_site by
+        default), and outputs are cut at the first stop sequence. Prompts
+        too long for the model raise PromptTooLongError unless truncate is set.
+        """
+        if call_site in self.assisted_call_sites:
+            generator = self.assisted_generator
+            tokenizer, model = self._gpt2.get()
+        else:
+            generator = self.text_generator
+            tokenizer, model = generator.tokenizer, generator.model
+        
+        stops = list(stop_sequences or ())
+        prompt, planned = self.budget.plan(
+            tokenizer, model, prompt, task or call_site,
+            input_text=input_text, stop_sequences=stops, truncate=truncate
+        )
+        outputs = generator(prompt, **planned, **generate_kwargs)
+        for output in outputs:
+            output['generated_text'] = self.budget.trim_at_stop(output['generated_text'], prompt, stops)
+        return outputs
+
+    def _generate_batch(self, prompts: List[str], task: str,
+                        input_texts: Optional[List[str]] = None,
+                        **generate_kwargs) -> List[List[Dict[str, Any]]]:
+        """Run several prompts through the text generator as padded batches.
+
+        The batch shares the smallest planned token budget. Returns one list
+        of generated sequences per prompt. Batched tasks (storytelling and
+        quiz options) add to the content rather than replace it, so
+        oversized prompts are truncated.
+        """
+        if not prompts:
+            return []
+        
+        generator = self.text_generator
+        tokenizer = generator.tokenizer
+        if tokenizer.pad_token_id is None:
+            # GPT-2 has no pad token; pad with EOS on the left for generation
+            tokenizer.pad_token_id = generator.model.config.eos_token_id
+        tokenizer.padding_side = "left"
+        
+        plans = [
+            self.budget.plan(tokenizer, generator.model, prompt, task, input_text=input_text, truncate=True)
+            for prompt, input_text in zip(prompts, input_texts or [None] * len(prompts))
+        ]
+        prompts = [prompt for prompt, _ in plans]
+        planned = self.budget.batch_plan([kwargs for _, kwargs in plans])
+        
+        outputs = generator(prompts, batch_size=self.batch_size, **planned, **generate_kwargs)
+        # A single sequence per prompt may come back unwrapped
+        return [out if isinstance(out, list) else [out] for out in outputs]
 
     def _analyze_emotions(self, content: str) -> Dict[str, float]:
         """Analyze emotional content of text"""
@@ -1,15 +1,24 @@
 from typing import Dict, Any, List
 from .base_agent import BaseAgent
+from src.utils.text_analytics import analyze_text
+from src.utils.keyword_matcher import get_keyword_matcher
+from src.models.structured_output import OutputSchema, StructuredOutput
 import asyncio
 from datetime import datetime
-import re
 import logging
 
 logger = logging.getLogger(__name__)
 
+KEYWORD_SCHEMA = OutputSchema(
+    "keywords",
+    {"primary": list, "secondary": list, "long_tail": list},
+    {"secondary": [], "long_tail": []}
+)
+
 class SEOAgent(BaseAgent):
     def __init__(self, model):
         self.model = model
+        self.keyword_output = StructuredOutput(KEYWORD_SCHEMA, "seo")
         
         # Comprehensive SEO guidelines
         self.seo_strategy = {
@@ -103,40 +112,41 @@ class SEOAgent(BaseAgent):
         Format as JSON with 'primary', 'secondary', and 'long_tail' lists.
         """
         
-        response = await self.model.generate_content(prompt)
-        # Parse JSON response
-        return eval(response)
+        # Parse the JSON response, repairing common defects locally
+        keywords = await self.keyword_output.generate(self.model, prompt)
+        if not keywords or not keywords['primary']:
+            raise ValueError(f"Could not parse keywords for topic: {topic}")
+        return keywords
 
     async def analyze_seo_metrics(self, content: str, keywords: Dict[str, List[str]]) -> Dict[str, Any]:
-        # Calculate basic SEO metrics
-        word_count = len(content.split())
-        keyword_density = self._calculate_keyword_density(content, keywords['primary'][0])
-        readability_score = self._calculate_readability(content)
+        # Calculate basic SEO metrics from one memoized tokenization
+        stats = analyze_text(content)
+        lowered = content.lower()
+        # Every primary, secondary and long-tail keyword is counted in one pass
+        all_keywords = [keyword for group in keywords.values() for keyword in group]
+        counts = get_keyword_matcher(all_keywords).count(content)
+        densities = {
+            keyword: count / stats.word_count if stats.word_count else 0
+            for keyword, count in counts.items()
+        }
         
         return {
-            "word_count": word_count,
-            "keyword_density": keyword_density,
-            "readability_score": readability_score,
-            "has_meta_description": bool(re.search(r'meta description:', content.lower())),
-            "has_title_tag": bool(re.search(r'title tag:', content.lower())),
-            "header_count": len(re.findall(r'#{1,6}\s', content))
+            "word_count": stats.word_count,
+            "keyword_density": densities.get(keywords['primary'][0], 0),
+            "keyword_densities": densities,
+            "readability_score": stats.flesch_reading_ease,
+            "has_meta_description": 'meta description:' in lowered,
+            "has_title_tag": 'title tag:' in lowered,
+            "header_count": stats.header_count
         }
 
     def _calculate_keyword_density(self, content: str, keyword: str) -> float:
-        word_count = len(content.split())
-        keyword_count = len(re.findall(rf'\b{keyword}\b', content.lower()))
-        return keyword_count / word_count if word_count > 0 else 0
+        word_count = analyze_text(content).word_count
+        count = get_keyword_matcher([keyword]).count(content)[keyword]
+        return count / word_count if word_count > 0 else 0
 
     def _calculate_readability(self, content: str) -> float:
-        sentences = len(re.findall(r'[.!?]+', content))
-        words = len(content.split())
-        syllables = len(re.findall(r'[aeiou]+', content.lower()))
-        
-        if sentences == 0 or words == 0:
-            return 0
-        
-        # Simplified Flesch Reading Ease score
-        return 206.835 - 1.015 * (words / sentences) - 84.6 * (syllables / words)
+        return analyze_text(content).flesch_reading_ease
 
     async def process_request(self, content: Dict[str, Any]) -> Dict[str, Any]:
         try:
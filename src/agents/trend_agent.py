@@ -1,44 +1,72 @@
 import os
 from typing import Dict, Any, List
 import asyncio
+import threading
 from .base_agent import BaseAgent
 import logging
 from datetime import datetime
-from pytrends.request import TrendReq
-import praw
-from newsapi import NewsApiClient
+from src.utils.trend_cache import get_trend_cache
 
 logger = logging.getLogger(__name__)
 
 class TrendAnalysisAgent(BaseAgent):
     def __init__(self, model):
         self.model = model
-        self.pytrends = TrendReq(hl='en-US', tz=360)
-        
-        # Initialize Reddit client only if credentials exist
-        reddit_client_id = os.getenv('REDDIT_CLIENT_ID')
-        reddit_client_secret = os.getenv('REDDIT_CLIENT_SECRET')
-        
-        self.reddit = None
-        if reddit_client_id and reddit_client_secret:
-            self.reddit = praw.Reddit(
-                client_id=reddit_client_id,
-                client_secret=reddit_client_secret,
-                user_agent="TrendAnalysisAgent/1.0"
-            )
-        
-        self.news_api = NewsApiClient(api_key=os.getenv('NEWS_API_KEY'))
+        # Source clients are created on first use so importing and
+        # constructing the agent stays cheap
+        self._pytrends = None
+        self._reddit = None
+        self._news_api = None
+        # pytrends keeps the current query on the client, so one request at a time
+        self._pytrends_lock = threading.Lock()
+        self.cache = get_trend_cache()
+
+    @property
+    def pytrends(self):
+        if self._pytrends is None:
+            from pytrends.request import TrendReq
+            self._pytrends = TrendReq(hl='en-US', tz=360)
+        return self._pytrends
+
+    @property
+    def reddit(self):
+        """Reddit client, or None when credentials are missing"""
+        if self._reddit is None:
+            reddit_client_id = os.getenv('REDDIT_CLIENT_ID')
+            reddit_client_secret = os.getenv('REDDIT_CLIENT_SECRET')
+            if reddit_client_id and reddit_client_secret:
+                import praw
+                self._reddit = praw.Reddit(
+                    client_id=reddit_client_id,
+                    client_secret=reddit_client_secret,
+                    user_agent="TrendAnalysisAgent/1.0"
+                )
+        return self._reddit
+
+    @property
+    def news_api(self):
+        if self._news_api is None:
+            from newsapi import NewsApiClient
+            self._news_api = NewsApiClient(api_key=os.getenv('NEWS_API_KEY'))
+        return self._news_api
 
     async def get_google_trends(self, keyword: str) -> List[Dict]:
         """Fetch trending topics from Google Trends"""
         try:
-            self.pytrends.build_payload([keyword], timeframe='today 1-m')
-            related_topics = self.pytrends.related_topics()
-            return related_topics[keyword]['rising'].to_dict('records')
+            return await self.cache.get(
+                ("google", keyword.strip().casefold()),
+                lambda: asyncio.to_thread(self._fetch_google_trends, keyword)
+            )
         except Exception as e:
             logger.error(f"Google Trends error: {str(e)}")
             return []
 
+    def _fetch_google_trends(self, keyword: str) -> List[Dict]:
+        with self._pytrends_lock:
+            self.pytrends.build_payload([keyword], timeframe='today 1-m')
+            related_topics = self.pytrends.related_topics()
+        return related_topics[keyword]['rising'].to_dict('records')
+
     async def get_reddit_trends(self, keyword: str) -> List[Dict]:
         """Fetch trending posts from Reddit"""
         if not self.reddit:
@@ -46,17 +74,23 @@ class TrendAnalysisAgent(BaseAgent):
             return []
             
         try:
-            subreddit = self.reddit.subreddit('all')
-            posts = subreddit.search(keyword, limit=10, sort='hot')
-            return [{
-                'title': post.title,
-                'score': post.score,
-                'url': post.url
-            } for post in posts]
+            return await self.cache.get(
+                ("reddit", keyword.strip().casefold()),
+                lambda: asyncio.to_thread(self._fetch_reddit_trends, keyword)
+            )
         except Exception as e:
             logger.error(f"Reddit API error: {str(e)}")
             return []
 
+    def _fetch_reddit_trends(self, keyword: str) -> List[Dict]:
+        subreddit = self.reddit.subreddit('all')
+        posts = subreddit.search(keyword, limit=10, sort='hot')
+        return [{
+            'title': post.title,
+            'score': post.score,
+            'url': post.url
+        } for post in posts]
+
     async def calculate_virality_score(self, topic_data: Dict) -> float:
         """Calculate virality score based on various metrics"""
         score = 0
@@ -79,7 +113,8 @@ class TrendAnalysisAgent(BaseAgent):
 
     async def process_request(self, topic: str) -> Dict[str, Any]:
         try:
-            # Gather data from multiple sources
+            # Gather data from multiple sources; the blocking clients run in
+            # worker threads so the sources are queried concurrently
             tasks = [
                 self.get_google_trends(topic),
                 self.get_reddit_trends(topic)
@@ -1,15 +1,8 @@
-from transformers import (
-    AutoTokenizer,
-    AutoModelForCausalLM,
-    VisionEncoderDecoderModel,
-    ViTImageProcessor
-)
-import matplotlib.pyplot as plt
-import plotly.express as px
 import base64
 import logging
 from typing import Dict, Any, List
 import io
+from src.models.model_registry import lease_causal_lm, lease_image_captioner, release_leases
 
 class VisualGeneratorAgent:
     """Agent responsible for generating visuals and charts"""
@@ -17,17 +10,30 @@ class VisualGeneratorAgent:
     def __init__(self, config: Any):
         self.logger = logging.getLogger(__name__)
         
-        try:
-            # Initialize models
-            self.tokenizer = AutoTokenizer.from_pretrained("gpt2")
-            self.model = AutoModelForCausalLM.from_pretrained("gpt2")
-            self.image_processor = ViTImageProcessor.from_pretrained("nlpconnect/vit-gpt2-image-captioning")
-            self.caption_model = VisionEncoderDecoderModel.from_pretrained("nlpconnect/vit-gpt2-image-captioning")
-            self.logger.info("Visual generator initialized successfully")
-            
-        except Exception as e:
-            self.logger.error(f"Failed to initialize visual generator: {e}")
-            raise
+        # Models are shared through the registry and loaded on first use
+        self._gpt2 = lease_causal_lm("gpt2")
+        self._captioner = lease_image_captioner("nlpconnect/vit-gpt2-image-captioning")
+        self.logger.info("Visual generator initialized successfully")
+
+    def release_models(self):
+        """Release the shared local models this agent leased"""
+        release_leases(self)
+
+    @property
+    def tokenizer(self):
+        return self._gpt2.get()[0]
+
+    @property
+    def model(self):
+        return self._gpt2.get()[1]
+
+    @property
+    def image_processor(self):
+        return self._captioner.get()[0]
+
+    @property
+    def caption_model(self):
+        return self._captioner.get()[1]
 
     async def generate_visuals(self, content: Dict[str, Any]) -> Dict[str, Any]:
         """Generate visuals for the content"""
@@ -49,6 +55,7 @@ class VisualGeneratorAgent:
         charts = []
         try:
             if data:
+                import plotly.express as px
                 # Create bar chart
                 fig = px.bar(data)
                 chart_html = fig.to_html(include_plotlyjs=True, full_html=False)
@@ -67,6 +74,7 @@ class VisualGeneratorAgent:
         diagrams = []
         try:
             if concepts:
+                import matplotlib.pyplot as plt
                 fig, ax = plt.subplots(figsize=(10, 6))
                 ax.text(0.5, 0.5, "\n".join(concepts), ha='center', va='center')
                 
@@ -1,33 +1,42 @@
-from transformers import (
-    pipeline,
-    AutoTokenizer,
-    AutoModelForCausalLM,
-    VisionEncoderDecoderModel,
-    ViTImageProcessor
-)
-import matplotlib.pyplot as plt
-import plotly.express as px
-import plotly.graph_objects as go
 import base64
-from PIL import Image
 import io
-import numpy as np
 from typing import List, Dict, Any, Union
 import logging
 import json
+from src.models.model_registry import lease_causal_lm, lease_image_captioner, release_leases
 
 class VisualGeneratorAgent:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         
-        # Initialize image generation model
-        self.tokenizer = AutoTokenizer.from_pretrained("gpt2")
-        self.model = AutoModelForCausalLM.from_pretrained("gpt2")
-        
-        # Initialize image captioning model
-        self.caption_processor = ViTImageProcessor.from_pretrained("nlpconnect/vit-gpt2-image-captioning")
-        self.caption_model = VisionEncoderDecoderModel.from_pretrained("nlpconnect/vit-gpt2-image-captioning")
-        self.caption_tokenizer = AutoTokenizer.from_pretrained("nlpconnect/vit-gpt2-image-captioning")
+        # Image generation and captioning models, shared through the registry
+        # and loaded on first use
+        self._gpt2 = lease_causal_lm("gpt2")
+        self._captioner = lease_image_captioner("nlpconnect/vit-gpt2-image-captioning")
+
+    def release_models(self):
+        """Release the shared local models this agent leased"""
+        release_leases(self)
+
+    @property
+    def tokenizer(self):
+        return self._gpt2.get()[0]
+
+    @property
+    def model(self):
+        return self._gpt2.get()[1]
+
+    @property
+    def caption_processor(self):
+        return self._captioner.get()[0]
+
+    @property
+    def caption_model(self):
+        return self._captioner.get()[1]
+
+    @property
+    def caption_tokenizer(self):
+        return self._captioner.get()[2]
 
     async def generate_visuals(self, content: Dict[str, Any]) -> Dict[str, Any]:
         """Main method to generate all visual content"""
@@ -75,6 +84,7 @@ class VisualGeneratorAgent:
                 image = self.image_generator.generate(**inputs)
                 
                 # Convert to PIL Image
+                from PIL import Image
                 image = Image.fromarray(image[0])
                 
                 # Generate caption
@@ -97,6 +107,7 @@ class VisualGeneratorAgent:
 
     def _generate_charts(self, data_points: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate charts using Plotly"""
+        import plotly.express as px
         charts = []
         
         for chart_type, data in data_points.items():
@@ -126,6 +137,7 @@ class VisualGeneratorAgent:
         infographics = []
         
         try:
+            import matplotlib.pyplot as plt
             # Create figure with subplots
             fig, ax = plt.subplots(figsize=(12, 8))
             
@@ -158,6 +170,7 @@ class VisualGeneratorAgent:
     def _generate_interactive_elements(self, key_points: Dict[str, Any]) -> Dict[str, str]:
         """Generate HTML/JavaScript code for interactive elements"""
         # Generate interactive visualization using Plotly
+        import plotly.graph_objects as go
         fig = go.Figure()
         
         for point in key_points['data_points'].get('interactive', []):
@@ -192,7 +205,7 @@ class VisualGeneratorAgent:
         </script>
         """
 
-    async def _generate_caption(self, image: Image) -> str:
+    async def _generate_caption(self, image: "Image.Image") -> str:
         """Generate caption for an image using the caption model"""
         try:
             inputs = self.caption_processor(image, return_tensors="pt")
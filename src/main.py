@@ -79,6 +79,8 @@ async def main():
         
     except Exception as e:
         print(f"Error: {e}")
+    finally:
+        chaitu.engine.release_models()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
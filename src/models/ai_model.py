@@ -1,19 +1,14 @@
-from google.generativeai import configure, GenerativeModel
 import logging
+from src.models.gemini_model import GeminiModel
+from src.models.base_model import DEFAULT_MAX_IN_FLIGHT
 
-class AIModel:
+class AIModel(GeminiModel):
     """Model class for interacting with Google's Gemini API"""
-    
-    def __init__(self, api_key: str):
-        self.logger = logging.getLogger(__name__)
-        configure(api_key=api_key)
-        self.model = GenerativeModel('gemini-pro')
 
-    async def generate_content(self, prompt: str) -> str:
-        """Generate content based on the provided prompt"""
-        try:
-            response = self.model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            self.logger.error(f"Content generation failed: {e}")
-            raise 
\ No newline at end of file
+    # Unlike GeminiModel, failures are raised to the caller
+    swallow_errors = False
+
+    def __init__(self, api_key: str, model_name: str = 'gemini-pro',
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+        super().__init__(api_key, model_name, max_in_flight)
+        self.logger = logging.getLogger(__name__)
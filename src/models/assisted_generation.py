@@ -0,0 +1,98 @@
+from typing import Any, Dict, List, Optional
+import logging
+import threading
+import time
+from src.models.model_registry import count_forward_passes, lease_causal_lm, release_leases
+
+logger = logging.getLogger(__name__)
+
+class AssistedGenerator:
+    """Assisted (speculative) decoding with a small draft model.
+
+    The draft model (distilgpt2 by default) proposes a few tokens at a time
+    and the target model (gpt2) checks them in one forward pass. Greedy
+    output is identical to the target model's own output. Calls return the
+    same shape as a text-generation pipeline, so it can stand in for one at
+    a call site.
+
+    Acceptance is measured by counting forward passes on the calling thread
+    with the counting hook the registry installs on every causal LM.
+    Each target pass yields its accepted draft tokens plus one of its own,
+    so accepted = new_tokens - target_passes, out of draft_passes proposals.
+    """
+
+    def __init__(self, target: str = "gpt2", draft: str = "distilgpt2"):
+        self.target_name = target
+        self.draft_name = draft
+        self._target = lease_causal_lm(target)
+        self._draft = lease_causal_lm(draft)
+        self._lock = threading.Lock()
+        self.stats = {
+            "calls": 0,
+            "new_tokens": 0,
+            "seconds": 0.0,
+            "draft_tokens": 0,
+            "accepted_tokens": 0
+        }
+
+    def release_models(self):
+        release_leases(self)
+
+    @property
+    def acceptance_rate(self) -> float:
+        drafted = self.stats["draft_tokens"]
+        return self.stats["accepted_tokens"] / drafted if drafted else 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        seconds = self.stats["seconds"]
+        return self.stats["new_tokens"] / seconds if seconds else 0.0
+
+    def get_target(self):
+        """Return the (tokenizer, model) pair of the target model"""
+        return self._target.get()
+
+    def export_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "acceptance_rate": self.acceptance_rate,
+            "tokens_per_second": self.tokens_per_second
+        }
+
+    def __call__(self, prompt: str, max_length: Optional[int] = None,
+                 max_new_tokens: Optional[int] = None, num_return_sequences: int = 1,
+                 **generate_kwargs) -> List[Dict[str, str]]:
+        if num_return_sequences != 1:
+            raise ValueError("Assisted decoding supports a single return sequence")
+
+        tokenizer, target = self.get_target()
+        _, draft = self._draft.get()
+        inputs = tokenizer(prompt, return_tensors="pt")
+        prompt_tokens = inputs["input_ids"].shape[-1]
+        if max_new_tokens is None and max_length is not None:
+            max_new_tokens = max(1, max_length - prompt_tokens)
+
+        started = time.monotonic()
+        with count_forward_passes() as passes:
+            output_ids = target.generate(
+                **inputs,
+                assistant_model=draft,
+                max_new_tokens=max_new_tokens,
+                **{"pad_token_id": tokenizer.eos_token_id, **generate_kwargs}
+            )
+        elapsed = time.monotonic() - started
+        counts = {"target": passes.get(id(target), 0), "draft": passes.get(id(draft), 0)}
+
+        new_tokens = output_ids.shape[-1] - prompt_tokens
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["new_tokens"] += new_tokens
+            self.stats["seconds"] += elapsed
+            self.stats["draft_tokens"] += counts["draft"]
+            self.stats["accepted_tokens"] += max(0, new_tokens - counts["target"])
+        logger.debug(
+            f"Assisted decoding: {new_tokens} tokens in {elapsed:.2f}s, "
+            f"acceptance {self.acceptance_rate:.0%}"
+        )
+
+        return [{"generated_text": tokenizer.decode(output_ids[0], skip_special_tokens=True)}]
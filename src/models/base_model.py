@@ -0,0 +1,161 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Callable, AsyncIterator, Tuple
+import asyncio
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_IN_FLIGHT = 8
+
+class ProviderPool:
+    """Shared client and in-flight limit for a single provider and API key"""
+
+    def __init__(self, provider: str, client: Any, max_in_flight: int, key_id: str = ""):
+        self.provider = provider
+        self.client = client
+        self.max_in_flight = max_in_flight
+        self.key_id = key_id
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+
+_provider_pools: Dict[Tuple[str, str], ProviderPool] = {}
+
+def _key_id(api_key: Optional[str]) -> str:
+    """Short fingerprint of an API key, so keys are never held as dict keys or logged"""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16] if api_key else ""
+
+def get_provider_pool(provider: str, client_factory: Callable[[int], Any],
+                      max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                      api_key: Optional[str] = None,
+                      single_key: bool = False) -> ProviderPool:
+    """Return the process-wide pool for a provider and API key, creating it on first use.
+
+    Every model instance for the same provider and key shares one client
+    (and so one set of pooled connections) and one in-flight limit. Models
+    with different keys get separate pools. single_key marks providers whose
+    SDK holds one key per process; a second, different key raises ValueError.
+    """
+    key_id = _key_id(api_key)
+    pool = _provider_pools.get((provider, key_id))
+    if pool is None:
+        if single_key and any(name == provider for name, _ in _provider_pools):
+            raise ValueError(
+                f"{provider} client is already configured with a different API key; "
+                f"its SDK supports one key per process"
+            )
+        pool = ProviderPool(provider, client_factory(max_in_flight), max_in_flight, key_id)
+        _provider_pools[(provider, key_id)] = pool
+    elif pool.max_in_flight != max_in_flight:
+        logger.warning(
+            f"{provider} pool already created with max_in_flight={pool.max_in_flight}; "
+            f"ignoring requested {max_in_flight}"
+        )
+    return pool
+
+@dataclass
+class StreamChunk:
+    """One piece of a streamed completion, shared by every model"""
+    text: str  # text delta since the previous chunk
+    index: int  # position of this chunk in the stream
+    done: bool = False  # True only on the final, empty chunk
+    finish_reason: Optional[str] = None
+
+async def collect_stream(stream: AsyncIterator[StreamChunk]) -> str:
+    """Join a chunk stream back into the full completion"""
+    return "".join([chunk.text async for chunk in stream])
+
+def make_request_key(namespace: str, params: Dict[str, Any], prompt: str) -> str:
+    """Identify a request by model name, parameters and a prompt hash"""
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    material = json.dumps(
+        {"model": namespace, "params": params, "prompt": prompt_hash},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+class BaseModel(ABC):
+    """Common async interface for all text generation models"""
+
+    provider = "base"
+    # Legacy models return None instead of raising from generate_content
+    swallow_errors = False
+
+    def __init__(self, model_name: str, generation_config: Optional[Dict[str, Any]] = None):
+        self.model_name = model_name
+        self.generation_config = dict(generation_config or {})
+        self.logger = logging.getLogger(self.__class__.__module__)
+
+    @property
+    def cache_namespace(self) -> str:
+        """Identifier for the model behind this instance"""
+        return f"{self.provider}:{self.model_name}"
+
+    @abstractmethod
+    async def complete(self, prompt: str, **params) -> str:
+        """Generate a completion, raising on any failure"""
+        pass
+
+    async def stream_content(self, prompt: str, **params) -> AsyncIterator[StreamChunk]:
+        """Yield text deltas as they arrive.
+
+        Models without native streaming yield the whole completion as a
+        single chunk.
+        """
+        text = await self.complete(prompt, **params)
+        yield StreamChunk(text, 0)
+        yield StreamChunk("", 1, done=True, finish_reason="stop")
+
+    async def generate_content(self, prompt: str, **params) -> Optional[str]:
+        """Generate content based on the provided prompt"""
+        try:
+            return await self.complete(prompt, **params)
+        except Exception as e:
+            self.logger.error(f"{self.provider} generation failed: {e}")
+            if self.swallow_errors:
+                return None
+            raise
+
+    def request_key(self, prompt: str, params: Dict[str, Any]) -> str:
+        return make_request_key(self.cache_namespace, self._params(params), prompt)
+
+    def _params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge per-call parameters over the instance defaults"""
+        return {**self.generation_config, **params}
+
+    def _provider_params(self, params: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """Split merged parameters into provider parameters and the json_mode flag.
+
+        json_mode=True asks for a bare JSON response; each provider maps it
+        to its own mechanism, or ignores it when it has none.
+        """
+        params = self._params(params)
+        return params, bool(params.pop("json_mode", False))
+
+class ModelWrapper(BaseModel):
+    """Base class for models that add behaviour around another model.
+
+    The wrappers are building blocks for whoever constructs a provider
+    model; the agents take an already built model and do not wrap it
+    themselves. A typical stack, outermost first, is
+    CachedModel(SingleFlightModel(ResilientModel(model, fallback=...))),
+    with HedgedModel combining two such stacks.
+    """
+
+    def __init__(self, model: BaseModel):
+        super().__init__(model.model_name, model.generation_config)
+        self.model = model
+        self.provider = model.provider
+        self.swallow_errors = model.swallow_errors
+
+    @property
+    def cache_namespace(self) -> str:
+        return self.model.cache_namespace
+
+    async def complete(self, prompt: str, **params) -> str:
+        return await self.model.complete(prompt, **params)
+
+    async def stream_content(self, prompt: str, **params) -> AsyncIterator[StreamChunk]:
+        async for chunk in self.model.stream_content(prompt, **params):
+            yield chunk
@@ -1,22 +1,66 @@
-from anthropic import Anthropic
-from typing import Any
-import asyncio
+from anthropic import AsyncAnthropic
+import httpx
 import logging
+from typing import Dict, Any, AsyncIterator, List, Tuple
+from src.models.base_model import BaseModel, StreamChunk, get_provider_pool, DEFAULT_MAX_IN_FLIGHT
 
-class ClaudeModel:
-    def __init__(self, api_key: str):
-        self.client = Anthropic(api_key=api_key)
+def claude_pool(api_key: str, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+    """Shared Anthropic pool backed by a single keep-alive httpx client"""
+    def factory(limit: int):
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=limit, max_keepalive_connections=limit)
+        )
+        return AsyncAnthropic(api_key=api_key, http_client=http_client)
+    return get_provider_pool("claude", factory, max_in_flight, api_key=api_key)
+
+class ClaudeModel(BaseModel):
+    provider = "claude"
+
+    def __init__(self, api_key: str, model_name: str = "claude-3-opus-20240229",
+                 max_tokens: int = 1000, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+        super().__init__(model_name, {"max_tokens": max_tokens})
+        self.pool = claude_pool(api_key, max_in_flight)
+        self.client = self.pool.client
         self.logger = logging.getLogger(__name__)
 
-    async def generate_content(self, prompt: str) -> str:
-        try:
-            response = await asyncio.to_thread(
-                self.client.messages.create,
-                model="claude-3-opus-20240229",
-                max_tokens=1000,
-                messages=[{"role": "user", "content": prompt}]
+    def _request(self, prompt: str, params: Dict[str, Any]) -> Tuple[List[Dict[str, str]], Dict[str, Any], str]:
+        """Return messages, API parameters and the assistant prefill.
+
+        There is no native JSON mode, so json_mode prefills the reply with
+        "{" to make the model continue a JSON object.
+        """
+        params, json_mode = self._provider_params(params)
+        messages = [{"role": "user", "content": prompt}]
+        prefill = "{" if json_mode else ""
+        if prefill:
+            messages.append({"role": "assistant", "content": prefill})
+        return messages, params, prefill
+
+    async def complete(self, prompt: str, **params) -> str:
+        messages, params, prefill = self._request(prompt, params)
+        async with self.pool.semaphore:
+            response = await self.client.messages.create(
+                model=self.model_name,
+                messages=messages,
+                **params
             )
-            return response.content[0].text
-        except Exception as e:
-            self.logger.error(f"Claude generation failed: {e}")
-            raise 
\ No newline at end of file
+        return prefill + response.content[0].text
+
+    async def stream_content(self, prompt: str, **params) -> AsyncIterator[StreamChunk]:
+        """Yield text deltas from the Messages streaming API"""
+        messages, params, prefill = self._request(prompt, params)
+        index = 0
+        if prefill:
+            yield StreamChunk(prefill, index)
+            index += 1
+        async with self.pool.semaphore:
+            async with self.client.messages.stream(
+                model=self.model_name,
+                messages=messages,
+                **params
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield StreamChunk(text, index)
+                    index += 1
+                message = await stream.get_final_message()
+        yield StreamChunk("", index, done=True, finish_reason=message.stop_reason)
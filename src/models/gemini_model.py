@@ -1,31 +1,82 @@
-import google.generativeai as genai
-from typing import Optional
+from typing import Dict, Any, Optional, AsyncIterator
 import logging
+from src.models.base_model import BaseModel, StreamChunk, get_provider_pool, DEFAULT_MAX_IN_FLIGHT
 
 logger = logging.getLogger(__name__)
 
-class GeminiModel:
-    def __init__(self, api_key: str):
+def gemini_pool(api_key: str, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+    """Shared Gemini pool; genai keeps one key and one async gRPC channel per process"""
+    def factory(limit: int):
+        import google.generativeai as genai
         genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-pro')
-    
-    async def generate_content(self, prompt: str) -> Optional[str]:
-        """Generate content with better error handling"""
-        try:
-            if not isinstance(prompt, str):
-                prompt = str(prompt)
-            prompt = prompt.strip()
-            
-            response = await self.model.generate_content_async(prompt)
-            
-            if hasattr(response, 'text'):
-                return response.text.strip()
-            elif hasattr(response, 'parts'):
-                parts = [str(part.text).strip() for part in response.parts if part.text]
-                return ' '.join(parts)
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Gemini model error: {str(e)}")
-            return None 
\ No newline at end of file
+        return genai
+    return get_provider_pool("gemini", factory, max_in_flight, api_key=api_key, single_key=True)
+
+# Model families that accept response_mime_type="application/json"
+JSON_MODE_PREFIXES = ("gemini-1.5", "gemini-2")
+
+class GeminiModel(BaseModel):
+    provider = "gemini"
+    swallow_errors = True
+
+    def __init__(self, api_key: str, model_name: str = 'gemini-pro',
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+        super().__init__(model_name)
+        self.pool = gemini_pool(api_key, max_in_flight)
+        self.model = self.pool.client.GenerativeModel(model_name)
+
+    async def complete(self, prompt: str, **params) -> str:
+        """Generate content without blocking the event loop"""
+        prompt = self._clean_prompt(prompt)
+
+        async with self.pool.semaphore:
+            response = await self.model.generate_content_async(
+                prompt,
+                generation_config=self._generation_config(params)
+            )
+
+        text = self._response_text(response)
+        if text is None:
+            raise ValueError("Gemini returned an empty response")
+        return text
+
+    async def stream_content(self, prompt: str, **params) -> AsyncIterator[StreamChunk]:
+        """Yield text deltas from a streamed Gemini response"""
+        prompt = self._clean_prompt(prompt)
+        index = 0
+        finish_reason = None
+        async with self.pool.semaphore:
+            response = await self.model.generate_content_async(
+                prompt,
+                generation_config=self._generation_config(params),
+                stream=True
+            )
+            async for part in response:
+                candidates = getattr(part, 'candidates', None)
+                if candidates and candidates[0].finish_reason:
+                    finish_reason = getattr(candidates[0].finish_reason, 'name', str(candidates[0].finish_reason))
+                text = self._response_text(part, strip=False)
+                if text:
+                    yield StreamChunk(text, index)
+                    index += 1
+        yield StreamChunk("", index, done=True, finish_reason=finish_reason or "stop")
+
+    def _generation_config(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        config, json_mode = self._provider_params(params)
+        if json_mode and self.model_name.startswith(JSON_MODE_PREFIXES):
+            config["response_mime_type"] = "application/json"
+        return config or None
+
+    def _clean_prompt(self, prompt) -> str:
+        if not isinstance(prompt, str):
+            prompt = str(prompt)
+        return prompt.strip()
+
+    def _response_text(self, response, strip: bool = True) -> Optional[str]:
+        """Extract text from a Gemini response"""
+        if hasattr(response, 'text'):
+            return response.text.strip() if strip else response.text
+        elif hasattr(response, 'parts'):
+            parts = [str(part.text).strip() for part in response.parts if part.text]
+            return ' '.join(parts)
+        return None
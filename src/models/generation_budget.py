@@ -0,0 +1,155 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# New tokens allowed per input token, by call site
+DEFAULT_TASK_RATIOS = {
+    "tone": 1.2,
+    "complexity": 1.2,
+    "improve": 1.0,
+    "storytelling": 0.5,
+    "quiz": 0.4,
+    "options": 0.3,
+}
+
+class PromptTooLongError(ValueError):
+    """The prompt leaves no room for min_new_tokens in the context window"""
+
+class StopOnSequences:
+    """Stopping criterion that ends generation once any stop sequence appears.
+
+    Implements the transformers StoppingCriteria call protocol without
+    importing transformers. Only text generated after the prompt is checked.
+    """
+
+    def __init__(self, tokenizer: Any, stop_sequences: Sequence[str], prompt_tokens: int):
+        self.tokenizer = tokenizer
+        self.stop_sequences = list(stop_sequences)
+        self.prompt_tokens = prompt_tokens
+        # Decode only enough trailing tokens to contain the longest stop sequence
+        self.window = max(len(tokenizer.encode(stop, add_special_tokens=False))
+                          for stop in self.stop_sequences) + 2
+
+    def __call__(self, input_ids, scores, **kwargs):
+        done = [self._stopped(row) for row in input_ids]
+        if len(done) == 1:
+            return done[0]
+        # Batched calls get one flag per row so finished rows stop independently
+        import torch
+        return torch.tensor(done, device=input_ids.device)
+
+    def _stopped(self, row) -> bool:
+        generated = row[self.prompt_tokens:]
+        tail = self.tokenizer.decode(generated[-self.window:], skip_special_tokens=True)
+        return any(stop in tail for stop in self.stop_sequences)
+
+class GenerationBudget:
+    """Plans token limits for local text generation.
+
+    max_new_tokens follows the tokenized input size and a per-task ratio. It
+    is clamped between min_new_tokens and max_new_tokens and always fits the
+    model's context window. Prompts too long to leave room for min_new_tokens
+    raise PromptTooLongError unless the caller allows truncation, so text
+    being rewritten is never cut short. Character counts are never used as
+    token limits.
+    """
+
+    def __init__(self, task_ratios: Optional[Dict[str, float]] = None,
+                 min_new_tokens: int = 16, max_new_tokens: int = 512,
+                 default_context_window: int = 1024):
+        self.task_ratios = {**DEFAULT_TASK_RATIOS, **(task_ratios or {})}
+        self.min_new_tokens = min_new_tokens
+        self.max_new_tokens = max_new_tokens
+        self.default_context_window = default_context_window
+
+    def context_window(self, tokenizer: Any, model: Any = None) -> int:
+        config = getattr(model, "config", None)
+        for attr in ("n_positions", "max_position_embeddings"):
+            value = getattr(config, attr, None)
+            if value:
+                return value
+        model_max = getattr(tokenizer, "model_max_length", None)
+        # Tokenizers without a real limit report a huge sentinel value
+        if model_max and model_max < 1_000_000:
+            return model_max
+        return self.default_context_window
+
+    def plan(self, tokenizer: Any, model: Any, prompt: str, task: str,
+             input_text: Optional[str] = None,
+             stop_sequences: Optional[Sequence[str]] = None,
+             truncate: bool = False) -> Tuple[str, Dict[str, Any]]:
+        """Return the prompt and generate kwargs for one call.
+
+        input_text is the content being transformed. The task ratio applies
+        to its length, and the whole prompt is used when it is not given.
+        Only with truncate=True is an oversized prompt cut to fit; use it for
+        tasks whose output does not replace the input.
+        """
+        window = self.context_window(tokenizer, model)
+        prompt_ids = tokenizer.encode(prompt, add_special_tokens=False)
+        input_tokens = (
+            len(tokenizer.encode(input_text, add_special_tokens=False))
+            if input_text is not None else len(prompt_ids)
+        )
+
+        ratio = self.task_ratios.get(task, 1.0)
+        wanted = int(input_tokens * ratio)
+        new_tokens = max(self.min_new_tokens, min(wanted, self.max_new_tokens))
+
+        if len(prompt_ids) + new_tokens > window:
+            room = window - len(prompt_ids)
+            if room >= self.min_new_tokens:
+                new_tokens = room
+            elif not truncate:
+                raise PromptTooLongError(
+                    f"{task} prompt of {len(prompt_ids)} tokens leaves no room to generate "
+                    f"in the {window}-token context"
+                )
+            else:
+                new_tokens = min(new_tokens, window // 2)
+                keep = window - new_tokens
+                logger.warning(
+                    f"Truncating {task} prompt from {len(prompt_ids)} to {keep} tokens "
+                    f"to fit the {window}-token context"
+                )
+                prompt_ids = prompt_ids[:keep]
+                prompt = tokenizer.decode(prompt_ids)
+
+        kwargs: Dict[str, Any] = {
+            "max_new_tokens": new_tokens,
+            "pad_token_id": tokenizer.eos_token_id,
+        }
+        if stop_sequences:
+            kwargs["stopping_criteria"] = self._stopping_criteria(
+                tokenizer, stop_sequences, len(prompt_ids)
+            )
+        return prompt, kwargs
+
+    def _stopping_criteria(self, tokenizer: Any, stop_sequences: Sequence[str],
+                           prompt_tokens: int) -> Any:
+        from transformers import StoppingCriteriaList
+        return StoppingCriteriaList([StopOnSequences(tokenizer, stop_sequences, prompt_tokens)])
+
+    @staticmethod
+    def trim_at_stop(text: str, prompt: str, stop_sequences: Optional[Sequence[str]]) -> str:
+        """Cut generated text at the first stop sequence after the prompt"""
+        if not stop_sequences:
+            return text
+        start = len(prompt) if text.startswith(prompt) else 0
+        cut = min(
+            (index for index in (text.find(stop, start) for stop in stop_sequences) if index >= 0),
+            default=-1
+        )
+        return text[:cut] if cut >= 0 else text
+
+    @staticmethod
+    def batch_plan(plans: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine per-prompt plans for one batched call.
+
+        The smallest budget wins, since the longest prompt was planned with
+        the least room left in the context window.
+        """
+        combined = dict(plans[0])
+        combined["max_new_tokens"] = min(plan["max_new_tokens"] for plan in plans)
+        return combined
@@ -0,0 +1,97 @@
+from collections import deque
+from typing import Dict, Any, Optional
+import asyncio
+import logging
+import time
+from src.models.base_model import BaseModel
+
+logger = logging.getLogger(__name__)
+
+class HedgedModel(BaseModel):
+    """Sends a request to a primary model and hedges slow calls to a backup.
+
+    If the primary has not answered within the given percentile of its recent
+    latencies, the same prompt is sent to the backup model. The first
+    successful answer wins and the other call is cancelled.
+    """
+
+    provider = "hedged"
+
+    def __init__(self, primary: BaseModel, backup: BaseModel,
+                 hedge_percentile: float = 95.0,
+                 initial_delay: float = 10.0,
+                 min_delay: float = 0.5,
+                 window: int = 200):
+        super().__init__(f"{primary.cache_namespace}|{backup.cache_namespace}")
+        self.primary = primary
+        self.backup = backup
+        self.swallow_errors = primary.swallow_errors
+        self.hedge_percentile = hedge_percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self._latencies = deque(maxlen=window)
+        self.stats = {
+            "requests": 0,
+            "hedged": 0,
+            "primary_wins": 0,
+            "backup_wins": 0,
+            "failures": 0
+        }
+
+    @property
+    def hedge_delay(self) -> float:
+        """Seconds to wait on the primary before sending the backup request"""
+        if len(self._latencies) < 10:
+            return self.initial_delay
+        latencies = sorted(self._latencies)
+        index = min(len(latencies) - 1, int(len(latencies) * self.hedge_percentile / 100))
+        return max(self.min_delay, latencies[index])
+
+    @property
+    def hedge_rate(self) -> float:
+        requests = self.stats["requests"]
+        return self.stats["hedged"] / requests if requests else 0.0
+
+    def export_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "hedge_rate": self.hedge_rate, "hedge_delay": self.hedge_delay}
+
+    async def complete(self, prompt: str, **params) -> str:
+        self.stats["requests"] += 1
+        started = time.monotonic()
+        primary = asyncio.ensure_future(self.primary.complete(prompt, **params))
+        backup: Optional[asyncio.Future] = None
+
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay)
+            if done and not primary.exception():
+                self._latencies.append(time.monotonic() - started)
+                self.stats["primary_wins"] += 1
+                return primary.result()
+
+            # Primary is slow or already failed: ask the backup as well
+            self.stats["hedged"] += 1
+            backup = asyncio.ensure_future(self.backup.complete(prompt, **params))
+            pending = {primary, backup}
+            errors = []
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception():
+                        errors.append(task.exception())
+                        continue
+                    if task is primary:
+                        self._latencies.append(time.monotonic() - started)
+                        self.stats["primary_wins"] += 1
+                    else:
+                        self.stats["backup_wins"] += 1
+                    return task.result()
+
+            self.stats["failures"] += 1
+            raise errors[-1]
+        finally:
+            if not primary.done():
+                # The primary took at least this long; keep it as a lower bound
+                self._latencies.append(time.monotonic() - started)
+            for task in (primary, backup):
+                if task is not None and not task.done():
+                    task.cancel()
@@ -1,17 +1,52 @@
-from transformers import pipeline
 import logging
+from src.models.model_registry import lease_pipeline, release_leases
+from src.models.inference_executor import get_inference_executor
+from src.models.assisted_generation import AssistedGenerator
+from src.models.generation_budget import GenerationBudget, PromptTooLongError
 
 logger = logging.getLogger(__name__)
 
 class HuggingFaceModel:
-    def __init__(self, model_name: str):
-        self.model = pipeline("text-generation", model=model_name)
+    def __init__(self, model_name: str, backend: str = None, assistant_model_name: str = None):
+        self.model_name = model_name
+        # backend: fp32, int8 or onnx (defaults to LOCAL_INFERENCE_BACKEND)
+        self._model = lease_pipeline("text-generation", model_name, backend=backend)
+        # With an assistant model, generation uses assisted (speculative) decoding
+        self.assisted_generator = (
+            AssistedGenerator(model_name, assistant_model_name) if assistant_model_name else None
+        )
+        self.executor = get_inference_executor()
+        self.budget = GenerationBudget()
+
+    def release_models(self):
+        release_leases(self)
+
+    @property
+    def model(self):
+        if self.assisted_generator is not None:
+            return self.assisted_generator
+        return self._model.get()
     
     async def improve_content(self, prompt: str) -> str:
         """Improve content using Hugging Face model"""
         try:
-            response = self.model(prompt, max_length=150)  # Adjust max_length as needed
+            # Resolve the model on the executor too, so a first-use load stays off the loop
+            response = await self.executor.run(self._generate, prompt)
             return response[0]['generated_text']
+        except PromptTooLongError as e:
+            # The output replaces the content, so never improve a truncated copy
+            logger.warning(f"Returning content unimproved: {str(e)}")
+            return prompt
         except Exception as e:
             logger.error(f"Hugging Face model error: {str(e)}")
-            return None 
\ No newline at end of file
+            return None
+
+    def _generate(self, prompt: str):
+        """Generate with a token budget planned from the prompt and context window"""
+        if self.assisted_generator is not None:
+            tokenizer, model = self.assisted_generator.get_target()
+        else:
+            pipeline = self._model.get()
+            tokenizer, model = pipeline.tokenizer, pipeline.model
+        prompt, planned = self.budget.plan(tokenizer, model, prompt, "improve")
+        return self.model(prompt, **planned)
@@ -0,0 +1,121 @@
+from typing import Any, Optional, Tuple
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("fp32", "int8", "onnx")
+DEFAULT_BACKEND = os.getenv("LOCAL_INFERENCE_BACKEND", "fp32")
+MODEL_CACHE_DIR = os.getenv("LOCAL_MODEL_CACHE_DIR", ".cache/models")
+
+# optimum.onnxruntime model class for each pipeline task
+ORT_MODEL_CLASSES = {
+    "text-generation": "ORTModelForCausalLM",
+    "text-classification": "ORTModelForSequenceClassification",
+    "summarization": "ORTModelForSeq2SeqLM",
+}
+
+def resolve_task_model(task: str, model: Optional[str]) -> Tuple[str, str]:
+    """Return the canonical task name and the model transformers would use for it"""
+    from transformers.pipelines import check_task
+    normalized_task, targeted_task, _ = check_task(task)
+    if model is None:
+        default = targeted_task["default"]["model"]
+        # transformers 4 keys defaults by framework ({"pt": (name, revision)});
+        # later releases store the (name, revision) pair directly
+        if isinstance(default, dict):
+            default = default["pt"]
+        model = default[0]
+    return normalized_task, model
+
+def _cache_path(model: str, backend: str) -> str:
+    return os.path.join(MODEL_CACHE_DIR, f"{model.replace('/', '--')}-{backend}")
+
+def load_pipeline(task: str, model: Optional[str] = None, device: int = -1,
+                  backend: str = DEFAULT_BACKEND, **kwargs) -> Any:
+    """Build a transformers pipeline on the requested CPU inference backend.
+
+    - fp32: the stock PyTorch model
+    - int8: PyTorch dynamic int8 quantization of every Linear layer
+      (GPT-2 style Conv1D layers are converted to Linear first)
+    - onnx: the model exported to an ONNX Runtime graph
+
+    Converted int8 and ONNX models are cached under LOCAL_MODEL_CACHE_DIR,
+    so only the first load pays for the conversion.
+    """
+    from transformers import pipeline
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend: {backend}")
+    if backend == "fp32":
+        return pipeline(task, model=model, device=device, **kwargs)
+
+    normalized_task, model = resolve_task_model(task, model)
+    if backend == "int8":
+        return pipeline(task, model=_load_int8(task, model), tokenizer=model, device=device, **kwargs)
+    return pipeline(task, model=_load_onnx(normalized_task, model), tokenizer=model, **kwargs)
+
+def _conv1d_to_linear(model: Any) -> int:
+    """Replace transformers Conv1D layers with equivalent nn.Linear layers.
+
+    GPT-2 and distilgpt2 use Conv1D for attention and MLP projections, and
+    quantize_dynamic only knows nn.Linear. Returns the number replaced.
+    """
+    import torch
+    from transformers.pytorch_utils import Conv1D
+
+    targets = [name for name, module in model.named_modules() if isinstance(module, Conv1D)]
+    for name in targets:
+        conv = model.get_submodule(name)
+        in_features, out_features = conv.weight.shape  # Conv1D stores the weight transposed
+        linear = torch.nn.Linear(in_features, out_features, bias=conv.bias is not None)
+        with torch.no_grad():
+            linear.weight.copy_(conv.weight.t())
+            if conv.bias is not None:
+                linear.bias.copy_(conv.bias)
+        parent_name, _, child_name = name.rpartition(".")
+        setattr(model.get_submodule(parent_name) if parent_name else model, child_name, linear)
+    return len(targets)
+
+def _load_int8(task: str, model: str) -> Any:
+    import torch
+    # Caches from before Conv1D conversion left GPT-2 layers unquantized
+    path = f"{_cache_path(model, 'int8')}-linear.pt"
+    if os.path.exists(path):
+        return torch.load(path, weights_only=False)
+
+    from transformers import pipeline
+    fp32_model = pipeline(task, model=model).model
+    converted = _conv1d_to_linear(fp32_model)
+    quantized = torch.quantization.quantize_dynamic(
+        fp32_model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+    dynamic_linear = torch.ao.nn.quantized.dynamic.Linear
+    quantized.quantized_modules = sum(
+        isinstance(module, dynamic_linear) for module in quantized.modules()
+    )
+    if quantized.quantized_modules == 0:
+        logger.warning(f"int8 backend quantized no layers of {model}; it will run as fp32")
+    else:
+        logger.info(f"Quantized {quantized.quantized_modules} layers of {model} to int8 "
+                    f"({converted} converted from Conv1D)")
+    os.makedirs(MODEL_CACHE_DIR, exist_ok=True)
+    torch.save(quantized, path)
+    logger.info(f"Cached int8 {model} at {path}")
+    return quantized
+
+def _load_onnx(task: str, model: str) -> Any:
+    import optimum.onnxruntime
+    class_name = ORT_MODEL_CLASSES.get(task)
+    if class_name is None:
+        raise ValueError(f"No ONNX Runtime export for task: {task}")
+    model_class = getattr(optimum.onnxruntime, class_name)
+
+    path = _cache_path(model, "onnx")
+    if os.path.isdir(path):
+        return model_class.from_pretrained(path)
+
+    ort_model = model_class.from_pretrained(model, export=True)
+    ort_model.save_pretrained(path)
+    logger.info(f"Cached ONNX export of {model} at {path}")
+    return ort_model
@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+class InferenceExecutor:
+    """Runs blocking local-model inference off the event loop.
+
+    Uses a thread pool rather than a process pool. Models from the model
+    registry live in this process and torch releases the GIL inside its
+    kernels, so threads can share weights without copying them. Work beyond
+    the bounded queue waits for a free slot, which pushes back on callers
+    instead of letting work pile up without limit.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 32,
+                 torch_threads: Optional[int] = None):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.torch_threads = torch_threads or max(1, (os.cpu_count() or 1) // workers)
+        self._pool = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="inference",
+            initializer=self._init_worker
+        )
+        self._slots = asyncio.Semaphore(workers + max_queue)
+        self.stats = {"submitted": 0, "waiting": 0}
+
+    def _init_worker(self):
+        try:
+            import torch
+        except ImportError:
+            return
+        # torch's intra-op pool is process-wide; split the CPUs between workers
+        # so concurrent calls do not oversubscribe the machine
+        torch.set_num_threads(self.torch_threads)
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) on the pool and await its result"""
+        self.stats["waiting"] += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.stats["waiting"] -= 1
+        try:
+            self.stats["submitted"] += 1
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, partial(fn, *args, **kwargs))
+        finally:
+            self._slots.release()
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
+
+_executor: Optional[InferenceExecutor] = None
+
+def get_inference_executor() -> InferenceExecutor:
+    """Return the process-wide inference executor, configured from the environment"""
+    global _executor
+    if _executor is None:
+        workers = int(os.getenv("INFERENCE_WORKERS", "2"))
+        max_queue = int(os.getenv("INFERENCE_QUEUE_SIZE", "32"))
+        torch_threads = os.getenv("TORCH_THREADS_PER_WORKER")
+        _executor = InferenceExecutor(
+            workers, max_queue, int(torch_threads) if torch_threads else None
+        )
+    return _executor
@@ -0,0 +1,147 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Tuple
+import hashlib
+import logging
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+class MapReduceSummarizer:
+    """Summarizes documents longer than the summarization model's context.
+
+    The text is split into token-bounded chunks along paragraph and sentence
+    boundaries. The chunks are summarized in batches (map), and the joined
+    chunk summaries are summarized again to the requested length (reduce).
+    Chunk summaries are cached by content hash. Chunk boundaries are chosen
+    by content, so an edit only changes the chunks around it, and
+    re-summarizing an edited article recomputes only those chunks.
+    """
+
+    def __init__(self, get_pipeline: Callable[[], Any], batch_size: int = 4,
+                 map_max_length: int = 150, map_min_length: int = 30,
+                 cache_size: int = 2048, anchor_every: int = 4, max_rounds: int = 3):
+        self.get_pipeline = get_pipeline
+        self.batch_size = batch_size
+        self.map_max_length = map_max_length
+        self.map_min_length = map_min_length
+        self.cache_size = cache_size
+        # On average one paragraph in anchor_every closes a chunk early, which
+        # keeps chunk boundaries stable when earlier paragraphs are edited
+        self.anchor_every = anchor_every
+        self.max_rounds = max_rounds
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"chunks": 0, "cached_chunks": 0}
+
+    def summarize(self, text: str, max_length: int, min_length: int) -> str:
+        """Summarize text of any length to roughly max_length tokens"""
+        return self.summarize_lengths(text, [(max_length, min_length)])[0]
+
+    def summarize_lengths(self, text: str, lengths: List[Tuple[int, int]]) -> List[str]:
+        """Summarize text once per (max_length, min_length) pair.
+
+        The map step runs once and is shared by every requested length, so
+        a summary and a TL;DR of the same article cost one map plus two
+        reduce calls.
+        """
+        summarizer = self.get_pipeline()
+        tokenizer = summarizer.tokenizer
+        limit = self._chunk_token_limit(tokenizer)
+
+        # Map chunk summaries until the combined text fits in one call; the
+        # final call truncates whatever is left after max_rounds
+        rounds = 0
+        while rounds < self.max_rounds and self._count_tokens(tokenizer, text) > limit:
+            chunks = self.chunk(text, tokenizer, limit)
+            text = " ".join(self._summarize_chunks(summarizer, chunks))
+            rounds += 1
+
+        return [
+            summarizer(
+                text,
+                max_length=max_length,
+                min_length=min_length,
+                do_sample=False,
+                truncation=True
+            )[0]['summary_text']
+            for max_length, min_length in lengths
+        ]
+
+    def chunk(self, text: str, tokenizer: Any, limit: int) -> List[str]:
+        """Split text into chunks of at most limit tokens"""
+        chunks: List[str] = []
+        current: List[str] = []
+        current_tokens = 0
+        for unit, tokens in self._units(text, tokenizer, limit):
+            if current and current_tokens + tokens > limit:
+                chunks.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            current.append(unit)
+            current_tokens += tokens
+            if current_tokens >= limit // 4 and self._is_anchor(unit):
+                chunks.append("\n\n".join(current))
+                current, current_tokens = [], 0
+        if current:
+            chunks.append("\n\n".join(current))
+        return chunks
+
+    def _units(self, text: str, tokenizer: Any, limit: int):
+        """Yield (unit, token_count) for paragraphs, splitting oversized ones"""
+        for paragraph in re.split(r"\n\s*\n", text):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            tokens = self._count_tokens(tokenizer, paragraph)
+            if tokens <= limit:
+                yield paragraph, tokens
+                continue
+            for sentence in re.split(r"(?<=[.!?])\s+", paragraph):
+                ids = tokenizer.encode(sentence, add_special_tokens=False)
+                # A single sentence longer than the limit is cut by tokens
+                for start in range(0, len(ids), limit):
+                    piece = ids[start:start + limit]
+                    yield tokenizer.decode(piece), len(piece)
+
+    def _is_anchor(self, unit: str) -> bool:
+        digest = hashlib.sha256(unit.encode("utf-8")).digest()
+        return digest[0] % self.anchor_every == 0
+
+    def _summarize_chunks(self, summarizer: Any, chunks: List[str]) -> List[str]:
+        keys = [hashlib.sha256(chunk.encode("utf-8")).hexdigest() for chunk in chunks]
+        summaries: Dict[str, str] = {}
+        with self._lock:
+            for key in keys:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    summaries[key] = self._cache[key]
+
+        missing = [(key, chunk) for key, chunk in zip(keys, chunks) if key not in summaries]
+        self.stats["chunks"] += len(chunks)
+        self.stats["cached_chunks"] += len(chunks) - len(missing)
+        if missing:
+            outputs = summarizer(
+                [chunk for _, chunk in missing],
+                max_length=self.map_max_length,
+                min_length=self.map_min_length,
+                do_sample=False,
+                truncation=True,
+                batch_size=self.batch_size
+            )
+            with self._lock:
+                for (key, _), output in zip(missing, outputs):
+                    summaries[key] = output['summary_text']
+                    self._cache[key] = output['summary_text']
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return [summaries[key] for key in keys]
+
+    def _chunk_token_limit(self, tokenizer: Any) -> int:
+        # Tokenizers without a real limit report a huge model_max_length
+        model_max = getattr(tokenizer, "model_max_length", 1024)
+        return min(model_max, 1024) - 16
+
+    @staticmethod
+    def _count_tokens(tokenizer: Any, text: str) -> int:
+        return len(tokenizer.encode(text, add_special_tokens=False))
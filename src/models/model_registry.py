@@ -0,0 +1,246 @@
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
+import logging
+import os
+import threading
+import time
+import weakref
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_BUDGET_MB = int(os.getenv("MODEL_MEMORY_BUDGET_MB", "4096"))
+
+ModelKey = Tuple[Optional[str], str, str]
+
+def estimate_size(obj: Any) -> int:
+    """Best-effort size in bytes of a loaded model (0 when unknown)"""
+    if isinstance(obj, (tuple, list)):
+        return sum(estimate_size(item) for item in obj)
+    if hasattr(obj, "parameters") and callable(obj.parameters):
+        try:
+            return sum(p.numel() * p.element_size() for p in obj.parameters())
+        except Exception:
+            return 0
+    # transformers pipelines keep the network on .model
+    if hasattr(obj, "model") and hasattr(obj, "task"):
+        return estimate_size(obj.model)
+    return 0
+
+class _Entry:
+    def __init__(self, key: ModelKey, loader: Callable[[], Any], size_hint: int = 0):
+        self.key = key
+        self.loader = loader
+        self.size_hint = size_hint
+        self.value = None
+        self.size = 0
+        self.refcount = 0
+        self.last_used = 0.0
+        self.lock = threading.Lock()
+
+class ModelLease:
+    """Handle an agent holds on a shared model.
+
+    The model is loaded on the first get() and reloaded transparently if the
+    registry evicted it in the meantime. The lease is released by release(),
+    or when the lease is garbage collected with the object that held it.
+    """
+
+    def __init__(self, registry: "ModelRegistry", key: ModelKey):
+        self.registry = registry
+        self.key = key
+        self._finalizer = weakref.finalize(self, registry.release, key)
+        self._finalizer.atexit = False
+
+    @property
+    def released(self) -> bool:
+        return not self._finalizer.alive
+
+    def get(self) -> Any:
+        return self.registry.get(self.key)
+
+    def release(self):
+        self._finalizer()
+
+def release_leases(owner: Any):
+    """Release the model leases held by owner's attributes.
+
+    Attributes with their own release_models() (agents and model helpers)
+    release theirs too.
+    """
+    for value in vars(owner).values():
+        if isinstance(value, ModelLease):
+            value.release()
+        elif callable(getattr(type(value), "release_models", None)):
+            value.release_models()
+
+class ModelRegistry:
+    """Process-wide registry of local models keyed by name, task and device.
+
+    Models load lazily, are shared by every agent that leases the same key
+    and are reference counted by lease. When loaded models exceed the memory
+    budget, unleased models go first, then leased models idle for longer than
+    idle_timeout, least recently used first.
+    """
+
+    def __init__(self, memory_budget_mb: int = DEFAULT_MEMORY_BUDGET_MB,
+                 idle_timeout: float = 600.0):
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.idle_timeout = idle_timeout
+        self._entries: Dict[ModelKey, _Entry] = {}
+        self._lock = threading.RLock()
+        self.stats = {"loads": 0, "shared": 0, "evictions": 0}
+
+    def lease(self, name: Optional[str], task: str, loader: Callable[[], Any],
+              device: str = "cpu", size_hint: int = 0) -> ModelLease:
+        """Register interest in a model without loading it"""
+        key = (name, task, device)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry(key, loader, size_hint)
+                self._entries[key] = entry
+            else:
+                self.stats["shared"] += 1
+            entry.refcount += 1
+        return ModelLease(self, key)
+
+    def get(self, key: ModelKey) -> Any:
+        with self._lock:
+            entry = self._entries[key]
+        with entry.lock:
+            # Mark the entry as in use before a load, so eviction does not
+            # mistake it for one idle since startup
+            entry.last_used = time.monotonic()
+            if entry.value is None:
+                started = time.monotonic()
+                entry.value = entry.loader()
+                entry.size = estimate_size(entry.value) or entry.size_hint
+                self.stats["loads"] += 1
+                logger.info(
+                    f"Loaded {key[1]} model {key[0] or 'default'} on {key[2]} "
+                    f"({entry.size / 1e6:.0f} MB) in {time.monotonic() - started:.1f}s"
+                )
+                evict = True
+            else:
+                evict = False
+            entry.last_used = time.monotonic()
+            value = entry.value
+        if evict:
+            self._enforce_budget(keep=key)
+        return value
+
+    def release(self, key: ModelKey):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.refcount > 0:
+                entry.refcount -= 1
+        self._enforce_budget()
+
+    @property
+    def loaded_bytes(self) -> int:
+        return sum(entry.size for entry in self._entries.values() if entry.value is not None)
+
+    def _enforce_budget(self, keep: Optional[ModelKey] = None):
+        with self._lock:
+            if self.loaded_bytes <= self.memory_budget:
+                return
+            now = time.monotonic()
+            candidates = [
+                entry for entry in self._entries.values()
+                if entry.value is not None and entry.key != keep
+                and (entry.refcount == 0 or now - entry.last_used > self.idle_timeout)
+            ]
+            candidates.sort(key=lambda entry: (entry.refcount > 0, entry.last_used))
+            for entry in candidates:
+                if self.loaded_bytes <= self.memory_budget:
+                    break
+                # An entry whose lock is held is being loaded or handed out; skip it
+                if not entry.lock.acquire(blocking=False):
+                    continue
+                try:
+                    logger.info(f"Evicting idle {entry.key[1]} model {entry.key[0] or 'default'}")
+                    entry.value = None
+                    entry.size = 0
+                    self.stats["evictions"] += 1
+                finally:
+                    entry.lock.release()
+
+_registry: Optional[ModelRegistry] = None
+
+def get_registry() -> ModelRegistry:
+    """Return the process-wide model registry"""
+    global _registry
+    if _registry is None:
+        _registry = ModelRegistry()
+    return _registry
+
+def lease_pipeline(task: str, model: Optional[str] = None, device: int = -1,
+                   backend: Optional[str] = None, **kwargs) -> ModelLease:
+    """Lease a transformers pipeline; model=None uses the task's default model.
+
+    backend selects fp32, int8 or onnx CPU inference and defaults to
+    LOCAL_INFERENCE_BACKEND.
+    """
+    from src.models.inference_backends import DEFAULT_BACKEND
+    backend = backend or DEFAULT_BACKEND
+
+    def loader():
+        from src.models.inference_backends import load_pipeline
+        return load_pipeline(task, model, device, backend, **kwargs)
+    return get_registry().lease(model, f"pipeline:{task}:{backend}", loader, device=str(device))
+
+_forward_passes = threading.local()
+
+def _count_forward_pass(module, args, output):
+    counts = getattr(_forward_passes, "counts", None)
+    if counts is not None:
+        counts[id(module)] = counts.get(id(module), 0) + 1
+
+@contextmanager
+def count_forward_passes() -> Iterator[Dict[int, int]]:
+    """Count forward passes of leased causal LMs made on this thread.
+
+    Yields a dict of id(model) -> passes. Other threads running the same
+    shared model are not counted.
+    """
+    previous = getattr(_forward_passes, "counts", None)
+    _forward_passes.counts = counts = {}
+    try:
+        yield counts
+    finally:
+        _forward_passes.counts = previous
+
+def lease_causal_lm(name: str) -> ModelLease:
+    """Lease a (tokenizer, model) pair for a causal language model"""
+    def loader():
+        from transformers import AutoTokenizer, AutoModelForCausalLM
+        model = AutoModelForCausalLM.from_pretrained(name)
+        # Registered once, before the model is shared, so no call has to add
+        # or remove hooks while another thread runs the model
+        model.register_forward_hook(_count_forward_pass)
+        return AutoTokenizer.from_pretrained(name), model
+    return get_registry().lease(name, "causal-lm", loader)
+
+def lease_image_captioner(name: str) -> ModelLease:
+    """Lease an (image processor, vision encoder-decoder, tokenizer) triple"""
+    def loader():
+        from transformers import AutoTokenizer, VisionEncoderDecoderModel, ViTImageProcessor
+        return (
+            ViTImageProcessor.from_pretrained(name),
+            VisionEncoderDecoderModel.from_pretrained(name),
+            AutoTokenizer.from_pretrained(name)
+        )
+    return get_registry().lease(name, "image-captioning", loader)
+
+def lease_spacy(name: str = "en_core_web_sm", disable: Iterable[str] = ()) -> ModelLease:
+    """Lease a spaCy pipeline, optionally with some components disabled.
+
+    Pipelines with different disabled components are cached separately.
+    """
+    disable = sorted(disable)
+
+    def loader():
+        import spacy
+        return spacy.load(name, disable=disable)
+    task = f"spacy:-{'-'.join(disable)}" if disable else "spacy"
+    return get_registry().lease(name, task, loader, size_hint=15 * 1024 * 1024)
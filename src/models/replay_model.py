@@ -0,0 +1,235 @@
+from typing import Dict, Any, Optional, List, AsyncIterator
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+from src.models.base_model import BaseModel, ModelWrapper, StreamChunk, make_request_key
+
+logger = logging.getLogger(__name__)
+
+class Cassette:
+    """Compact store of recorded prompt -> response pairs.
+
+    Saved as gzipped JSON. Prompts are stored only as part of the request
+    key hash, so cassettes stay small and carry no prompt text.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str):
+        self.path = path
+        self.model = None
+        self.generation_config: Dict[str, Any] = {}
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            self.load()
+
+    @staticmethod
+    def key(prompt: str, params: Dict[str, Any]) -> str:
+        return make_request_key("cassette", params, prompt)
+
+    def load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        self.model = data.get("model")
+        self.generation_config = data.get("generation_config", {})
+        self.entries = data.get("entries", {})
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copy of the cassette contents that later record() calls do not change"""
+        return {
+            "version": self.VERSION,
+            "model": self.model,
+            "generation_config": dict(self.generation_config),
+            "entries": dict(self.entries)
+        }
+
+    def save(self, data: Optional[Dict[str, Any]] = None):
+        """Write the cassette, or a snapshot of it taken earlier"""
+        data = data or self.snapshot()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def record(self, key: str, response: str, latency: float):
+        self.entries[key] = {"response": response, "latency": round(latency, 4)}
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(key)
+
+class RecordingModel(ModelWrapper):
+    """Model wrapper that records every completion and its latency.
+
+    The cassette is written by close() and, during long sessions, after
+    every save_every new recordings (0 disables that). Writes run in a
+    worker thread from a snapshot, so they do not hold up calls being
+    recorded.
+    """
+
+    def __init__(self, model: BaseModel, cassette: Cassette, save_every: int = 100):
+        super().__init__(model)
+        self.cassette = cassette
+        self.save_every = save_every
+        self._unsaved = 0
+        self._save_lock = asyncio.Lock()
+        cassette.model = model.cache_namespace
+        cassette.generation_config = model.generation_config
+
+    async def complete(self, prompt: str, **params) -> str:
+        started = time.monotonic()
+        response = await self.model.complete(prompt, **params)
+        self.cassette.record(
+            self.cassette.key(prompt, self._params(params)),
+            response,
+            time.monotonic() - started
+        )
+        self._unsaved += 1
+        if self.save_every and self._unsaved >= self.save_every and not self._save_lock.locked():
+            await self.save()
+        return response
+
+    async def save(self):
+        async with self._save_lock:
+            if not self._unsaved:
+                return
+            data = self.cassette.snapshot()
+            self._unsaved = 0
+            await asyncio.to_thread(self.cassette.save, data)
+
+    async def close(self):
+        """Write any recordings not saved yet"""
+        await self.save()
+
+class LatencyDistribution:
+    """Seeded synthetic latency source for replayed responses.
+
+    kind is one of:
+    - "recorded": the recorded latency times scale
+    - "fixed": always mean seconds
+    - "uniform": between low and high seconds
+    - "lognormal": median mean seconds, spread sigma
+    - "none": no delay
+    """
+
+    def __init__(self, kind: str = "recorded", mean: float = 1.0, sigma: float = 0.5,
+                 low: float = 0.5, high: float = 2.0, scale: float = 1.0, seed: int = 0):
+        if kind not in ("recorded", "fixed", "uniform", "lognormal", "none"):
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        self.kind = kind
+        self.mean = mean
+        self.sigma = sigma
+        self.low = low
+        self.high = high
+        self.scale = scale
+        self.random = random.Random(seed)
+
+    def sample(self, recorded: Optional[float] = None) -> float:
+        if self.kind == "none":
+            return 0.0
+        if self.kind == "recorded":
+            return (recorded if recorded is not None else self.mean) * self.scale
+        if self.kind == "fixed":
+            return self.mean
+        if self.kind == "uniform":
+            return self.random.uniform(self.low, self.high)
+        return self.random.lognormvariate(0, self.sigma) * self.mean
+
+class SyntheticTextGenerator:
+    """Deterministic filler text for prompts missing from a cassette.
+
+    The same seed and prompt always produce the same text, so benchmark
+    runs stay reproducible.
+    """
+
+    WORDS = (
+        "content model data system research analysis result trend user article "
+        "performance quality process value approach market growth strategy example "
+        "evidence study impact review insight design platform network future audience "
+        "the a of and to in for with on by from is are can will should improves supports"
+    ).split()
+
+    def __init__(self, seed: int = 0, words: int = 300, sentence_words: int = 14,
+                 paragraph_sentences: int = 5):
+        self.seed = seed
+        self.words = words
+        self.sentence_words = sentence_words
+        self.paragraph_sentences = paragraph_sentences
+
+    def generate(self, prompt: str) -> str:
+        digest = hashlib.sha256(f"{self.seed}:{prompt}".encode("utf-8")).hexdigest()
+        rng = random.Random(int(digest[:16], 16))
+        paragraphs: List[str] = []
+        sentences: List[str] = []
+        remaining = self.words
+        while remaining > 0:
+            count = min(remaining, max(3, int(rng.gauss(self.sentence_words, 4))))
+            words = [rng.choice(self.WORDS) for _ in range(count)]
+            sentences.append(" ".join(words).capitalize() + ".")
+            remaining -= count
+            if len(sentences) == self.paragraph_sentences:
+                paragraphs.append(" ".join(sentences))
+                sentences = []
+        if sentences:
+            paragraphs.append(" ".join(sentences))
+        return "\n\n".join(paragraphs)
+
+class ReplayModel(BaseModel):
+    """Offline model that serves responses from a cassette.
+
+    Each response is delayed by a sample from the latency distribution.
+    Prompts missing from the cassette get synthetic text, or raise
+    KeyError when strict is set.
+    """
+
+    provider = "replay"
+
+    def __init__(self, cassette: Cassette,
+                 latency: Optional[LatencyDistribution] = None,
+                 generator: Optional[SyntheticTextGenerator] = None,
+                 strict: bool = False, stream_chunk_words: int = 8):
+        super().__init__(cassette.model or "synthetic", cassette.generation_config)
+        self.cassette = cassette
+        self.latency = latency or LatencyDistribution()
+        self.generator = generator or SyntheticTextGenerator()
+        self.strict = strict
+        self.stream_chunk_words = stream_chunk_words
+        self.stats = {"hits": 0, "misses": 0, "simulated_seconds": 0.0}
+
+    def _lookup(self, prompt: str, params: Dict[str, Any]):
+        entry = self.cassette.lookup(self.cassette.key(prompt, self._params(params)))
+        if entry is not None:
+            self.stats["hits"] += 1
+            return entry["response"], self.latency.sample(entry.get("latency"))
+        if self.strict:
+            raise KeyError("Prompt not found in cassette")
+        self.stats["misses"] += 1
+        return self.generator.generate(prompt), self.latency.sample()
+
+    async def complete(self, prompt: str, **params) -> str:
+        response, delay = self._lookup(prompt, params)
+        self.stats["simulated_seconds"] += delay
+        await asyncio.sleep(delay)
+        return response
+
+    async def stream_content(self, prompt: str, **params) -> AsyncIterator[StreamChunk]:
+        """Stream the response in word groups spread across the sampled latency"""
+        response, delay = self._lookup(prompt, params)
+        self.stats["simulated_seconds"] += delay
+        words = response.split(" ")
+        pieces = [
+            " ".join(words[i:i + self.stream_chunk_words])
+            for i in range(0, len(words), self.stream_chunk_words)
+        ]
+        step = delay / max(len(pieces), 1)
+        for index, piece in enumerate(pieces):
+            await asyncio.sleep(step)
+            yield StreamChunk(piece if index == 0 else " " + piece, index)
+        yield StreamChunk("", len(pieces), done=True, finish_reason="stop")
@@ -0,0 +1,169 @@
+from typing import Dict, Optional
+import asyncio
+import logging
+import random
+import time
+from src.models.base_model import BaseModel, ModelWrapper
+
+logger = logging.getLogger(__name__)
+
+# Provider SDK errors worth retrying, matched by class name so that neither
+# SDK has to be imported here
+RETRYABLE_ERROR_NAMES = {
+    # anthropic
+    "APIConnectionError", "APITimeoutError", "RateLimitError",
+    "InternalServerError", "OverloadedError",
+    # google.api_core
+    "ServiceUnavailable", "DeadlineExceeded", "ResourceExhausted",
+    "TooManyRequests", "InternalServerError", "BadGateway", "GatewayTimeout"
+}
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504, 529}
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the provider's circuit is open"""
+    pass
+
+def is_retryable(error: BaseException) -> bool:
+    """Return True for transient errors such as timeouts, throttling and 5xx"""
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    if type(error).__name__ in RETRYABLE_ERROR_NAMES:
+        return True
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    return status in RETRYABLE_STATUS_CODES
+
+class CircuitBreaker:
+    """Fails fast after repeated failures until the provider recovers.
+
+    After failure_threshold consecutive failures the circuit opens and calls
+    are refused for reset_timeout seconds. Then a single trial call is let
+    through (half-open). Its success closes the circuit and its failure
+    opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow_request(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit for {self.name} closed")
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def release(self):
+        """End a call that says nothing about provider health"""
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Circuit for {self.name} opened after {self.failures} failures")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+def get_circuit_breaker(name: str, failure_threshold: int = 5,
+                        reset_timeout: float = 30.0) -> CircuitBreaker:
+    """Return the process-wide circuit breaker for a provider and model"""
+    breaker = _circuit_breakers.get(name)
+    if breaker is None:
+        breaker = CircuitBreaker(name, failure_threshold, reset_timeout)
+        _circuit_breakers[name] = breaker
+    return breaker
+
+class ResilientModel(ModelWrapper):
+    """Model wrapper adding retries, a circuit breaker and a fallback model.
+
+    Retryable errors are retried with full-jitter exponential backoff. Every
+    wrapper around the same provider and model shares one circuit breaker.
+    While that circuit is open, or once retries are exhausted, the request
+    goes to the fallback model if one is configured.
+    """
+
+    def __init__(self, model: BaseModel, fallback: Optional[BaseModel] = None,
+                 max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0,
+                 timeout: Optional[float] = 60.0,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0):
+        super().__init__(model)
+        self.fallback = fallback
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.breaker = get_circuit_breaker(model.cache_namespace, failure_threshold, reset_timeout)
+        self.stats = {"retries": 0, "rejected": 0, "fallbacks": 0}
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry attempt"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    async def complete(self, prompt: str, **params) -> str:
+        try:
+            return await self._complete_with_retries(prompt, **params)
+        except Exception as e:
+            if self.fallback is None:
+                raise
+            self.stats["fallbacks"] += 1
+            logger.warning(
+                f"{self.cache_namespace} unavailable ({e}); "
+                f"falling back to {self.fallback.cache_namespace}"
+            )
+            return await self.fallback.complete(prompt, **params)
+
+    async def _complete_with_retries(self, prompt: str, **params) -> str:
+        for attempt in range(self.max_attempts):
+            if not self.breaker.allow_request():
+                self.stats["rejected"] += 1
+                raise CircuitOpenError(f"Circuit for {self.breaker.name} is open")
+            try:
+                if self.timeout:
+                    result = await asyncio.wait_for(
+                        self.model.complete(prompt, **params), self.timeout
+                    )
+                else:
+                    result = await self.model.complete(prompt, **params)
+            except asyncio.CancelledError:
+                self.breaker.release()
+                raise
+            except Exception as e:
+                if not is_retryable(e):
+                    # Bad requests do not mean the provider is unhealthy
+                    self.breaker.release()
+                    raise
+                self.breaker.record_failure()
+                if attempt == self.max_attempts - 1:
+                    raise
+                self.stats["retries"] += 1
+                delay = self.backoff_delay(attempt)
+                logger.warning(
+                    f"{self.cache_namespace} attempt {attempt + 1} failed ({e}); "
+                    f"retrying in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+            else:
+                self.breaker.record_success()
+                return result
@@ -0,0 +1,200 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, AsyncIterator
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from src.models.base_model import BaseModel, ModelWrapper, StreamChunk
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH", ".cache/responses.sqlite3")
+
+class ResponseCache:
+    """Two-tier prompt/response cache: in-memory LRU over a shared SQLite file.
+
+    The SQLite tier uses WAL mode so several worker processes can read and
+    write the same file. Entries expire per agent TTL and both tiers evict
+    least-recently-used entries once they exceed their size bound.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH,
+                 max_memory_entries: int = 1024,
+                 max_disk_bytes: int = 256 * 1024 * 1024,
+                 default_ttl: float = 24 * 3600,
+                 agent_ttls: Optional[Dict[str, float]] = None):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.default_ttl = default_ttl
+        self.agent_ttls = dict(agent_ttls or {})
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._conn = self._connect() if path else None
+        self._writes_since_prune = 0
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "miss_seconds": 0.0,
+            "saved_seconds": 0.0
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL, "
+            "accessed REAL NOT NULL, size INTEGER NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        conn.commit()
+        return conn
+
+    def ttl_for(self, agent: Optional[str]) -> float:
+        return self.agent_ttls.get(agent, self.default_ttl)
+
+    async def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > now:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    self._record_saving()
+                    return value
+                del self._memory[key]
+
+        if self._conn is not None:
+            row = await asyncio.to_thread(self._disk_get, key, now)
+            if row is not None:
+                expires, value = row
+                self._memory_put(key, value, expires)
+                self.stats["disk_hits"] += 1
+                self._record_saving()
+                return value
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: str, ttl: float, elapsed: float = 0.0):
+        expires = time.time() + ttl
+        self.stats["miss_seconds"] += elapsed
+        self._memory_put(key, value, expires)
+        if self._conn is not None:
+            await asyncio.to_thread(self._disk_put, key, value, expires)
+
+    def _record_saving(self):
+        """Credit a hit with the average latency of a miss"""
+        misses = self.stats["misses"]
+        if misses:
+            self.stats["saved_seconds"] += self.stats["miss_seconds"] / misses
+
+    @property
+    def hit_rate(self) -> float:
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+
+    def _memory_put(self, key: str, value: str, expires: float):
+        with self._lock:
+            self._memory[key] = (expires, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[float, str]]:
+        with self._disk_lock:
+            row = self._conn.execute(
+                "SELECT expires, value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[0] <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return row[0], row[1]
+
+    def _disk_put(self, key: str, value: str, expires: float):
+        size = len(value.encode("utf-8"))
+        with self._disk_lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires, accessed, size) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, expires, time.time(), size)
+            )
+            self._conn.commit()
+            self._writes_since_prune += 1
+            if self._writes_since_prune >= 50:
+                self._writes_since_prune = 0
+                self._prune()
+
+    def _prune(self):
+        """Drop expired rows, then least-recently-used rows over the size bound"""
+        self._conn.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total > self.max_disk_bytes:
+            excess = total - self.max_disk_bytes
+            rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed")
+            stale = []
+            for key, size in rows:
+                if excess <= 0:
+                    break
+                stale.append((key,))
+                excess -= size
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+        self._conn.commit()
+
+class CachedModel(ModelWrapper):
+    """Model wrapper that serves repeated prompts from a ResponseCache"""
+
+    def __init__(self, model: BaseModel, cache: ResponseCache, agent: Optional[str] = None):
+        super().__init__(model)
+        self.cache = cache
+        self.agent = agent
+
+    async def complete(self, prompt: str, **params) -> str:
+        key = self.request_key(prompt, params)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        started = time.monotonic()
+        response = await self.model.complete(prompt, **params)
+        if response:
+            await self.cache.set(
+                key, response, self.cache.ttl_for(self.agent), time.monotonic() - started
+            )
+        return response
+
+    async def stream_content(self, prompt: str, **params) -> AsyncIterator[StreamChunk]:
+        """Replay a cached completion as one chunk, or stream and store it"""
+        key = self.request_key(prompt, params)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            yield StreamChunk(cached, 0)
+            yield StreamChunk("", 1, done=True, finish_reason="cached")
+            return
+
+        started = time.monotonic()
+        parts = []
+        async for chunk in self.model.stream_content(prompt, **params):
+            parts.append(chunk.text)
+            yield chunk
+        response = "".join(parts)
+        if response:
+            await self.cache.set(
+                key, response, self.cache.ttl_for(self.agent), time.monotonic() - started
+            )
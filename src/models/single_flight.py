@@ -0,0 +1,83 @@
+from typing import Dict, Callable, Union
+import asyncio
+import logging
+from src.models.base_model import BaseModel, ModelWrapper
+
+logger = logging.getLogger(__name__)
+
+# Cancel the shared provider call once every caller waiting on it is gone
+CANCEL_WHEN_ABANDONED = "when_abandoned"
+# Let the shared call finish even with no callers left (e.g. to warm a cache)
+CANCEL_NEVER = "never"
+
+class _Flight:
+    """A provider call shared by every caller with the same request key"""
+
+    def __init__(self, task: asyncio.Task, policy: str):
+        self.task = task
+        self.policy = policy
+        self.waiters = 0
+
+class SingleFlightModel(ModelWrapper):
+    """Model wrapper that coalesces identical in-flight requests.
+
+    Concurrent callers with the same request key await one shared task. A
+    caller that is cancelled only detaches itself; the shared call keeps
+    running for the others and is cancelled according to the key's policy
+    once nobody is waiting on it.
+    """
+
+    def __init__(self, model: BaseModel,
+                 cancel_policy: Union[str, Callable[[str], str]] = CANCEL_WHEN_ABANDONED):
+        super().__init__(model)
+        self.cancel_policy = cancel_policy
+        self._flights: Dict[str, _Flight] = {}
+        self.stats = {"calls": 0, "coalesced": 0, "abandoned": 0}
+
+    def _policy_for(self, prompt: str) -> str:
+        if callable(self.cancel_policy):
+            return self.cancel_policy(prompt)
+        return self.cancel_policy
+
+    async def complete(self, prompt: str, **params) -> str:
+        key = self.request_key(prompt, params)
+        flight = self._flights.get(key)
+        if flight is None:
+            task = asyncio.ensure_future(self.model.complete(prompt, **params))
+            flight = _Flight(task, self._policy_for(prompt))
+            self._flights[key] = flight
+            task.add_done_callback(lambda _, key=key, flight=flight: self._finish(key, flight))
+            self.stats["calls"] += 1
+        else:
+            self.stats["coalesced"] += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if not flight.task.cancelled():
+                self._detach(key, flight)
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _detach(self, key: str, flight: _Flight):
+        """Called when a waiting caller is cancelled"""
+        if flight.waiters > 1 or flight.task.done():
+            return
+        self.stats["abandoned"] += 1
+        if flight.policy == CANCEL_WHEN_ABANDONED:
+            # Later callers must start a fresh call rather than join a cancelled one
+            del self._flights[key]
+            flight.task.cancel()
+
+    def _finish(self, key: str, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.task.cancelled():
+            # Retrieve the exception so an unawaited failure is not logged as lost
+            flight.task.exception()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
@@ -0,0 +1,315 @@
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+import ast
+import json
+import logging
+import re
+import threading
+from src.models.base_model import BaseModel, StreamChunk
+
+logger = logging.getLogger(__name__)
+
+FENCE = re.compile(r"```(?:json|JSON)?")
+SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+CLOSERS = {"{": "}", "[": "]"}
+LITERALS = ("true", "false", "null", *PYTHON_LITERALS)
+# A number cut off after its decimal point, sign or exponent marker
+PARTIAL_NUMBER = re.compile(r"(?:(?<=\d)\.|(?<=\d)[eE][-+]?|[-+])$")
+# A string that can only be an object key, left without its value
+DANGLING_KEY = re.compile(r'[{,]\s*"(?:[^"\\]|\\.)*"$')
+
+class JSONScanner:
+    """Finds the end of the first JSON value in text fed piece by piece.
+
+    Each character is examined once, so scanning a streamed response costs
+    the same as scanning the finished text. When the value found is not the
+    one wanted (prose like "see [1]"), skip() resumes the scan just after
+    its opening bracket.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._reset(0)
+
+    def _reset(self, position: int):
+        self.start = -1
+        self.end = -1
+        self._position = position
+        self._stack: List[str] = []
+        self._quote: Optional[str] = None
+        self._escape = False
+
+    @property
+    def complete(self) -> bool:
+        return self.end >= 0
+
+    def feed(self, text: str) -> bool:
+        """Add text; returns True once the first top-level value has closed"""
+        self.buffer += text
+        return self._scan()
+
+    def skip(self) -> bool:
+        """Drop the current value and look for the next one after its opener"""
+        if self.start >= 0:
+            self._reset(self.start + 1)
+        return self._scan()
+
+    def _scan(self) -> bool:
+        if self.complete:
+            return True
+        for index in range(self._position, len(self.buffer)):
+            char = self.buffer[index]
+            if self.start < 0:
+                if char in CLOSERS:
+                    self.start = index
+                    self._stack.append(char)
+                continue
+            if self._quote:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == self._quote:
+                    self._quote = None
+            elif char in "\"'":
+                self._quote = char
+            elif char in CLOSERS:
+                self._stack.append(char)
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if not self._stack:
+                    self.end = index + 1
+                    self._position = self.end
+                    return True
+        self._position = len(self.buffer)
+        return False
+
+    @property
+    def segment(self) -> str:
+        """The first value, or everything after its opening bracket if unfinished"""
+        if self.start < 0:
+            return ""
+        return self.buffer[self.start:self.end] if self.complete else self.buffer[self.start:]
+
+def _repair(segment: str) -> str:
+    """Rewrite common model JSON defects in one pass.
+
+    Handles single-quoted strings, Python literals, unquoted keys, trailing
+    commas, and values cut off mid-string, mid-literal, mid-number or
+    mid-object.
+    """
+    out: List[str] = []
+    stack: List[str] = []
+    quote: Optional[str] = None
+    escape = False
+    index = 0
+    while index < len(segment):
+        char = segment[index]
+        if quote:
+            if escape:
+                escape = False
+                out.append(char)
+            elif char == "\\":
+                escape = True
+                out.append(char)
+            elif char == quote:
+                quote = None
+                out.append('"')
+            elif char == '"':
+                out.append('\\"')  # double quote inside a single-quoted string
+            elif char == "\n":
+                out.append("\\n")
+            else:
+                out.append(char)
+        elif char in "\"'":
+            quote = char
+            out.append('"')
+        elif char in CLOSERS:
+            stack.append(CLOSERS[char])
+            out.append(char)
+        elif char in "}]":
+            _drop_trailing_comma(out)
+            if stack:
+                stack.pop()
+            out.append(char)
+        elif char.isalpha() or char == "_":
+            end = index
+            while end < len(segment) and (segment[end].isalnum() or segment[end] == "_"):
+                end += 1
+            word = segment[index:end]
+            rest = segment[end:].lstrip()
+            if rest.startswith(":"):
+                out.append(f'"{word}"')
+            elif end == len(segment):
+                # The output stops inside a literal such as tru or Fals
+                literal = next((lit for lit in LITERALS if lit.startswith(word)), word)
+                out.append(PYTHON_LITERALS.get(literal, literal))
+            else:
+                out.append(PYTHON_LITERALS.get(word, word))
+            index = end
+            continue
+        else:
+            out.append(char)
+        index += 1
+
+    # Close whatever the model left open
+    if quote:
+        if escape:
+            out.pop()
+        out.append('"')
+    text = PARTIAL_NUMBER.sub("", "".join(out).rstrip()).rstrip()
+    if stack and stack[-1] == "}" and DANGLING_KEY.search(text):
+        text += ":"
+    if text.endswith(":"):
+        text += " null"
+    while text.endswith(","):
+        text = text[:-1].rstrip()
+    return text + "".join(reversed(stack))
+
+def _drop_trailing_comma(out: List[str]):
+    index = len(out) - 1
+    while index >= 0 and out[index].isspace():
+        index -= 1
+    if index >= 0 and out[index] == ",":
+        del out[index]
+
+def _parse_segment(segment: str) -> Tuple[Optional[Any], bool]:
+    try:
+        return json.loads(segment), False
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(_repair(segment)), True
+    except json.JSONDecodeError:
+        pass
+    try:
+        # Python-literal output (the old eval path) without executing anything
+        return ast.literal_eval(segment), True
+    except (ValueError, SyntaxError):
+        return None, False
+
+def _accepts(value: Any, expected: Optional[type]) -> bool:
+    return value is not None and (expected is None or isinstance(value, expected))
+
+def extract_json(text: str, expected: Optional[type] = None) -> Tuple[Optional[Any], bool]:
+    """Parse the first JSON object or array in model output.
+
+    With expected (dict or list), values of another type are passed over.
+    Returns (value, repaired); value is None when nothing usable was found.
+    """
+    if not text:
+        return None, False
+    text = FENCE.sub("", str(text)).strip()
+    try:
+        value = json.loads(text)
+        if _accepts(value, expected):
+            return value, False
+    except json.JSONDecodeError:
+        pass
+
+    # Brackets in the prose around the value ("see [1]") are tried first and
+    # skipped when they do not parse to the expected type
+    scanner = JSONScanner()
+    scanner.feed(text.translate(SMART_QUOTES))
+    while scanner.segment:
+        value, repaired = _parse_segment(scanner.segment)
+        if _accepts(value, expected):
+            return value, repaired
+        scanner.skip()
+    return None, False
+
+class OutputSchema:
+    """Expected shape of a structured response.
+
+    fields maps each key to its expected type. Missing or mistyped fields
+    take their default. A field without a default is required, and the
+    parse fails when it is missing.
+    """
+
+    def __init__(self, name: str, fields: Dict[str, type],
+                 defaults: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.fields = fields
+        self.defaults = dict(defaults or {})
+
+    def example(self) -> str:
+        """JSON exemplar to embed in prompts"""
+        return json.dumps(self.defaults, indent=2)
+
+    def validate(self, value: Any) -> Optional[Dict[str, Any]]:
+        if not isinstance(value, dict):
+            return None
+        result = dict(value)
+        for key, expected in self.fields.items():
+            field = result.get(key)
+            if isinstance(field, expected):
+                continue
+            if expected is list and isinstance(field, str):
+                result[key] = [field]
+            elif key in self.defaults:
+                result[key] = json.loads(json.dumps(self.defaults[key]))  # fresh copy
+            else:
+                return None
+        return result
+
+_parse_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+def _record(agent: str, outcome: str):
+    with _stats_lock:
+        stats = _parse_stats.setdefault(agent, {"parsed": 0, "repaired": 0, "failed": 0})
+        stats[outcome] += 1
+
+def parse_failure_rates() -> Dict[str, Dict[str, Any]]:
+    """Structured-output outcomes and failure rate per agent"""
+    with _stats_lock:
+        return {
+            agent: {**stats, "failure_rate": stats["failed"] / max(1, sum(stats.values()))}
+            for agent, stats in _parse_stats.items()
+        }
+
+class StructuredOutput:
+    """Requests, parses and validates JSON output for one agent call site"""
+
+    def __init__(self, schema: OutputSchema, agent: str):
+        self.schema = schema
+        self.agent = agent
+
+    def parse(self, text: Optional[str]) -> Optional[Dict[str, Any]]:
+        value, repaired = extract_json(text, expected=dict)
+        result = self.schema.validate(value)
+        if result is None:
+            _record(self.agent, "failed")
+            logger.warning(f"{self.agent}: could not parse {self.schema.name} output")
+        else:
+            _record(self.agent, "repaired" if repaired else "parsed")
+        return result
+
+    async def generate(self, model: BaseModel, prompt: str, **params) -> Optional[Dict[str, Any]]:
+        """Complete prompt in the provider's JSON mode and parse the result"""
+        response = await model.generate_content(prompt, json_mode=True, **params)
+        return self.parse(response)
+
+    async def generate_streamed(self, model: BaseModel, prompt: str,
+                                **params) -> Optional[Dict[str, Any]]:
+        """Stream the response and stop reading once the JSON value closes"""
+        stream = model.stream_content(prompt, json_mode=True, **params)
+        return self.parse(await read_json_stream(stream, expected=dict))
+
+async def read_json_stream(stream: AsyncIterator[StreamChunk],
+                           expected: Optional[type] = None) -> str:
+    """Collect streamed text up to the end of its first usable JSON value"""
+    scanner = JSONScanner()
+    try:
+        async for chunk in stream:
+            if chunk.done:
+                break
+            scanner.feed(chunk.text)
+            while scanner.complete and not _accepts(_parse_segment(scanner.segment)[0], expected):
+                scanner.skip()
+            if scanner.complete:
+                break
+    finally:
+        await stream.aclose()
+    return scanner.segment or scanner.buffer
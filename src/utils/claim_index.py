@@ -0,0 +1,232 @@
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import atexit
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from src.utils.fact_check_client import normalize_claim
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = os.getenv("CLAIM_INDEX_PATH", ".cache/claim_index")
+
+class ClaimIndex:
+    """Similarity index of verified claims and their verdicts.
+
+    Claims are embedded as L2-normalized hashed character n-gram vectors.
+    Hashing needs no fitted vocabulary, so claims can be added one at a
+    time without re-vectorizing the index.
+
+    Vectors are stored feature-major (n_features x claims, CSR), so a
+    query's cosine similarities are one sparse product that only touches
+    the n-grams the query contains. Recently added claims wait in a small
+    claim-major block until merge_every of them accumulate. Top-k uses
+    argpartition on each result row.
+
+    Verdicts older than max_age (the verdict cache TTL by default) are not
+    reused; such claims are checked again and re-adding them refreshes the
+    stored verdict.
+
+    The index persists as a compressed float32 sparse matrix next to a
+    gzipped JSON list of claims, verdicts and their timestamps. It is saved
+    every save_every new claims and by close(), which runs at exit for the
+    process-wide index.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_INDEX_PATH, threshold: float = 0.85,
+                 n_features: int = 2 ** 18, ngram_range: Tuple[int, int] = (3, 5),
+                 save_every: int = 1000, merge_every: int = 4096,
+                 max_age: float = 6 * 3600):
+        self.path = path
+        self.threshold = threshold
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.save_every = save_every
+        self.merge_every = merge_every
+        self.max_age = max_age
+        self.claims: List[str] = []
+        self.verdicts: List[Any] = []
+        self.added_at: List[float] = []  # wall-clock time each verdict was stored
+        self._added_array = None  # numpy copy of added_at, rebuilt after changes
+        self._rows: Dict[str, int] = {}  # normalized claim -> row
+        self._inverted = None  # n_features x merged claims
+        self._pending = []  # claim-major rows added since the last merge
+        self._pending_rows = 0
+        self._unsaved = 0
+        self._vectorizer = None
+        self._lock = threading.RLock()
+        self.stats = {"lookups": 0, "reused": 0, "expired": 0}
+        if path and os.path.exists(self._vectors_path):
+            self.load()
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.path, "vectors.npz")
+
+    @property
+    def _claims_path(self) -> str:
+        return os.path.join(self.path, "claims.json.gz")
+
+    def __len__(self) -> int:
+        return len(self.claims)
+
+    def vectorize(self, claims: Iterable[str]):
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import HashingVectorizer
+            self._vectorizer = HashingVectorizer(
+                analyzer="char_wb",
+                ngram_range=self.ngram_range,
+                n_features=self.n_features,
+                alternate_sign=False,
+                norm="l2"
+            )
+        import numpy as np
+        vectors = self._vectorizer.transform([normalize_claim(claim) for claim in claims])
+        return vectors.astype(np.float32)
+
+    def _pending_block(self):
+        """Claim-major matrix of the rows not merged yet (None when empty)"""
+        if not self._pending:
+            return None
+        if len(self._pending) > 1:
+            import scipy.sparse
+            self._pending = [scipy.sparse.vstack(self._pending, format="csr")]
+        return self._pending[0]
+
+    def _merge(self):
+        """Fold pending rows into the feature-major matrix"""
+        block = self._pending_block()
+        if block is None:
+            return
+        import scipy.sparse
+        columns = block.T.tocsr()
+        self._inverted = columns if self._inverted is None else scipy.sparse.hstack(
+            [self._inverted, columns], format="csr"
+        )
+        self._pending, self._pending_rows = [], 0
+
+    def add(self, claims: Iterable[str], verdicts: Iterable[Any]):
+        """Store verified claims; re-adding a claim replaces its verdict and timestamp"""
+        new_claims: List[str] = []
+        now = time.time()
+        with self._lock:
+            self._added_array = None
+            for claim, verdict in zip(claims, verdicts):
+                key = normalize_claim(claim)
+                row = self._rows.get(key)
+                if row is not None:
+                    self.verdicts[row] = verdict
+                    self.added_at[row] = now
+                    self._unsaved += 1
+                    continue
+                self._rows[key] = len(self.claims)
+                self.claims.append(claim)
+                self.verdicts.append(verdict)
+                self.added_at.append(now)
+                new_claims.append(claim)
+            if new_claims:
+                self._pending.append(self.vectorize(new_claims))
+                self._pending_rows += len(new_claims)
+                if self._pending_rows >= self.merge_every:
+                    self._merge()
+            self._unsaved += len(new_claims)
+            if self.path and self._unsaved >= self.save_every:
+                self.save()
+
+    def query(self, claims: List[str], k: int = 5,
+              max_age: Optional[float] = None) -> List[List[Tuple[str, float, Any]]]:
+        """Top-k stored (claim, similarity, verdict) for each query claim.
+
+        With max_age, claims stored longer ago than max_age seconds are skipped.
+        """
+        import numpy as np
+        import scipy.sparse
+        with self._lock:
+            if not self.claims or not claims:
+                return [[] for _ in claims]
+            vectors = self.vectorize(claims)
+            parts = []
+            if self._inverted is not None:
+                parts.append(vectors @ self._inverted)
+            pending = self._pending_block()
+            if pending is not None:
+                parts.append(vectors @ pending.T)
+            scores = scipy.sparse.hstack(parts, format="csr") if len(parts) > 1 else parts[0].tocsr()
+            if max_age is not None:
+                if self._added_array is None:
+                    self._added_array = np.asarray(self.added_at, dtype=np.float64)
+                oldest = time.time() - max_age
+            results = []
+            for i in range(len(claims)):
+                start, end = scores.indptr[i], scores.indptr[i + 1]
+                rows, values = scores.indices[start:end], scores.data[start:end]
+                if max_age is not None:
+                    fresh = self._added_array[rows] >= oldest
+                    rows, values = rows[fresh], values[fresh]
+                if len(values) > k:
+                    top = np.argpartition(-values, k - 1)[:k]
+                    rows, values = rows[top], values[top]
+                order = np.argsort(-values)
+                results.append([
+                    (self.claims[row], float(value), self.verdicts[row])
+                    for row, value in zip(rows[order], values[order])
+                ])
+            return results
+
+    def lookup(self, claims: List[str]) -> Dict[str, Any]:
+        """Stored verdicts for claims whose nearest fresh neighbour clears the threshold"""
+        reused = {}
+        for claim, matches in zip(claims, self.query(claims, k=1, max_age=self.max_age)):
+            if matches and matches[0][1] >= self.threshold:
+                reused[claim] = matches[0][2]
+        self.stats["lookups"] += len(claims)
+        self.stats["reused"] += len(reused)
+        return reused
+
+    def save(self):
+        import scipy.sparse
+        with self._lock:
+            self._merge()
+            if self._inverted is None:
+                return
+            os.makedirs(self.path, exist_ok=True)
+            scipy.sparse.save_npz(self._vectors_path, self._inverted, compressed=True)
+            with gzip.open(self._claims_path, "wt", encoding="utf-8") as f:
+                json.dump({"claims": self.claims, "verdicts": self.verdicts,
+                           "added_at": self.added_at}, f)
+            self._unsaved = 0
+        logger.info(f"Saved {len(self.claims)} verified claims to {self.path}")
+
+    def close(self):
+        """Write claims added since the last save"""
+        if self.path and self._unsaved:
+            self.save()
+
+    def load(self):
+        import scipy.sparse
+        with self._lock:
+            matrix = scipy.sparse.load_npz(self._vectors_path).tocsr()
+            with gzip.open(self._claims_path, "rt", encoding="utf-8") as f:
+                stored = json.load(f)
+            if matrix.shape != (self.n_features, len(stored["claims"])):
+                logger.warning(f"Ignoring claim index at {self.path}: shape {matrix.shape} does not match")
+                return
+            self._inverted, self._pending, self._pending_rows = matrix, [], 0
+            self.claims, self.verdicts = stored["claims"], stored["verdicts"]
+            # Indexes saved without timestamps count as expired
+            self.added_at = stored.get("added_at") or [0.0] * len(self.claims)
+            self._added_array = None
+            self._rows = {normalize_claim(claim): row for row, claim in enumerate(self.claims)}
+            self._unsaved = 0
+
+_claim_index: Optional[ClaimIndex] = None
+
+def get_claim_index() -> ClaimIndex:
+    """Return the process-wide claim index, loading it from disk on first use"""
+    global _claim_index
+    if _claim_index is None:
+        _claim_index = ClaimIndex()
+        atexit.register(_claim_index.close)
+    return _claim_index
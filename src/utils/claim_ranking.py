@@ -0,0 +1,62 @@
+from typing import Dict, List, Tuple
+from dataclasses import dataclass
+import math
+import re
+
+SENTENCE_END = re.compile(r"[.!?\n]")
+DIGIT = re.compile(r"\d")
+
+# Contribution of each salience signal to a claim's score
+SALIENCE_WEIGHTS = {
+    "frequency": 1.0,  # per log(1 + mentions)
+    "position": 0.5,   # 1.0 at the start of the article, 0.0 at the end
+    "numeric": 0.75,   # a mention sits in a sentence containing numbers
+    "heading": 1.0,    # a mention sits in a markdown heading
+}
+
+@dataclass
+class ClaimCandidate:
+    claim: str
+    score: float
+    mentions: int
+    first_position: float  # offset of the first mention as a fraction of the text
+    numeric: bool
+    in_heading: bool
+
+def _sentence(text: str, start: int, end: int) -> str:
+    window = max(0, start - 400)
+    before = max((m.end() for m in SENTENCE_END.finditer(text, window, start)), default=window)
+    after = SENTENCE_END.search(text, end)
+    return text[before:after.start() if after else len(text)]
+
+def _in_heading(text: str, start: int) -> bool:
+    line_start = text.rfind("\n", 0, start) + 1
+    return text[line_start:start + 1].lstrip().startswith("#")
+
+def rank_claims(text: str, mentions: List[Tuple[str, int]]) -> List[ClaimCandidate]:
+    """Score claims by salience, most salient first.
+
+    mentions are (entity text, start offset) pairs, one per occurrence.
+    Signals: mention frequency, position of the first mention, numbers
+    in a mentioning sentence, and mentions inside headings.
+    """
+    grouped: Dict[str, List[int]] = {}
+    for claim, start in mentions:
+        grouped.setdefault(claim, []).append(start)
+
+    length = max(1, len(text))
+    candidates = []
+    for claim, starts in grouped.items():
+        first = min(starts) / length
+        numeric = any(DIGIT.search(_sentence(text, start, start + len(claim))) for start in starts)
+        in_heading = any(_in_heading(text, start) for start in starts)
+        score = (
+            SALIENCE_WEIGHTS["frequency"] * math.log1p(len(starts))
+            + SALIENCE_WEIGHTS["position"] * (1 - first)
+            + SALIENCE_WEIGHTS["numeric"] * numeric
+            + SALIENCE_WEIGHTS["heading"] * in_heading
+        )
+        candidates.append(ClaimCandidate(claim, score, len(starts), first, numeric, in_heading))
+
+    candidates.sort(key=lambda candidate: (-candidate.score, candidate.first_position))
+    return candidates
@@ -0,0 +1,177 @@
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+import asyncio
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+def normalize_claim(claim: str) -> str:
+    """Case- and whitespace-insensitive form used to deduplicate claims"""
+    return " ".join(claim.casefold().split())
+
+class VerdictCache:
+    """In-memory TTL cache of fact-check verdicts keyed by (source, claim).
+
+    Shared by every agent in the process, so a claim checked for one
+    article is not sent again for the next until its TTL expires.
+    """
+
+    def __init__(self, ttl: float = 6 * 3600, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, key: Tuple[str, str]) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, verdict = entry
+                if expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return verdict
+                del self._entries[key]
+            self.stats["misses"] += 1
+            return None
+
+    def set(self, key: Tuple[str, str], verdict: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, verdict)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+_verdict_cache: Optional[VerdictCache] = None
+
+def get_verdict_cache() -> VerdictCache:
+    """Return the process-wide verdict cache"""
+    global _verdict_cache
+    if _verdict_cache is None:
+        _verdict_cache = VerdictCache()
+    return _verdict_cache
+
+class FactCheckClient:
+    """Concurrent fact-check queries over one pooled HTTP client.
+
+    Every (claim, source) pair is requested concurrently, with at most
+    max_per_host requests in flight per API host and a timeout on each
+    call. Claims are deduplicated after normalization and verdicts are
+    served from the shared cache when fresh.
+    """
+
+    def __init__(self, apis: Dict[str, str], max_per_host: int = 4,
+                 timeout: float = 5.0, cache: Optional[VerdictCache] = None):
+        self.apis = apis
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.cache = cache or get_verdict_cache()
+        self._client = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self.stats = {"requests": 0, "failures": 0, "deduplicated": 0}
+
+    @property
+    def client(self):
+        if self._client is None:
+            import httpx
+            hosts = {urlsplit(url).netloc for url in self.apis.values()} or {""}
+            limit = self.max_per_host * len(hosts)
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=limit, max_keepalive_connections=limit)
+            )
+        return self._client
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_limits[host]
+
+    async def check(self, claims: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Return {claim: {source: verdict}} for every claim with at least one verdict"""
+        verdicts, _ = await self.check_within(claims)
+        return verdicts
+
+    async def check_within(self, claims: Iterable[str], deadline: Optional[float] = None
+                           ) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """check() that gives up on claims still in flight after deadline seconds.
+
+        Requests start in claim order, so with a per-host cap the earliest
+        claims are answered first. Returns the verdicts and the claims that
+        were cut off by the deadline.
+        """
+        claims = list(claims)
+        unique: Dict[str, str] = {}
+        for claim in claims:
+            unique.setdefault(normalize_claim(claim), claim)
+        self.stats["deduplicated"] += len(claims) - len(unique)
+
+        verdicts: Dict[str, Dict[str, Any]] = {}
+        tasks = {}
+        for normalized, claim in unique.items():
+            pending = []
+            for source, url in self.apis.items():
+                cached = self.cache.get((source, normalized))
+                if cached is not None:
+                    verdicts.setdefault(normalized, {})[source] = cached
+                else:
+                    pending.append((source, url))
+            if pending:
+                tasks[normalized] = asyncio.ensure_future(self._check_claim(normalized, claim, pending))
+
+        unfinished = set()
+        if tasks:
+            _, late = await asyncio.wait(tasks.values(), timeout=deadline)
+            for task in late:
+                task.cancel()
+            for normalized, task in tasks.items():
+                if task in late:
+                    unfinished.add(normalized)
+                elif task.exception() is not None:
+                    # One claim failing unexpectedly leaves it unanswered, not the batch
+                    self.stats["failures"] += 1
+                    logger.error(f"Fact check failed for claim: {unique[normalized]} "
+                                 f"({task.exception()!r})")
+                elif task.result():
+                    verdicts.setdefault(normalized, {}).update(task.result())
+
+        # Every spelling of a claim maps to the verdicts of its normalized form
+        results = {
+            claim: verdicts[normalize_claim(claim)]
+            for claim in claims if normalize_claim(claim) in verdicts
+        }
+        return results, [claim for claim in claims if normalize_claim(claim) in unfinished and claim not in results]
+
+    async def _check_claim(self, normalized: str, claim: str,
+                           sources: List[Tuple[str, str]]) -> Dict[str, Any]:
+        fetched = await asyncio.gather(*(self._query(source, url, claim) for source, url in sources))
+        answered = {}
+        for (source, _), verdict in zip(sources, fetched):
+            if verdict is not None:
+                self.cache.set((source, normalized), verdict)
+                answered[source] = verdict
+        return answered
+
+    async def _query(self, source: str, url: str, claim: str) -> Optional[Any]:
+        import httpx
+        async with self._host_limit(url):
+            self.stats["requests"] += 1
+            try:
+                response = await self.client.get(url, params={"query": claim})
+                if response.status_code == 200:
+                    return response.json()  # Assuming the API returns JSON
+                logger.error(f"Failed to fetch from {source} for claim: {claim} ({response.status_code})")
+            except (httpx.HTTPError, ValueError) as e:
+                logger.error(f"Failed to fetch from {source} for claim: {claim} ({e!r})")
+            self.stats["failures"] += 1
+            return None
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -1,8 +1,16 @@
-import requests
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from typing import List
+from bisect import bisect_right
+from src.utils.keyword_matcher import get_keyword_matcher
+
+# Common indicators of factual statements
+FACT_INDICATORS = ['research shows', 'studies indicate', 'according to',
+                   'evidence suggests', 'data indicates']
 
 class FactChecker:
+    def __init__(self):
+        # One automaton finds every indicator in a single pass
+        self.matcher = get_keyword_matcher(FACT_INDICATORS, whole_words=False)
+
     def check_fact(self, statement: str) -> bool:
         """
         Placeholder for fact-checking logic.
@@ -12,16 +20,34 @@ class FactChecker:
         if not statement or len(statement) < 10:
             return False
         
-        # Check for common indicators of factual statements
-        fact_indicators = ['research shows', 'studies indicate', 'according to', 
-                         'evidence suggests', 'data indicates']
+        return self.matcher.search(statement)
+
+    def check_facts(self, statements: List[str]) -> List[bool]:
+        """check_fact for many statements with a single scan over all of them"""
+        # Statements are joined with newlines, and each match maps back to
+        # its statement by offset
+        offsets = []
+        position = 0
+        for statement in statements:
+            offsets.append(position)
+            position += len(statement) + 1
         
-        return any(indicator in statement.lower() for indicator in fact_indicators)
+        has_indicator = [False] * len(statements)
+        for start, _ in self.matcher.iter_matches("\n".join(statements)):
+            has_indicator[bisect_right(offsets, start) - 1] = True
+        
+        return [
+            found and bool(statement) and len(statement) >= 10
+            for statement, found in zip(statements, has_indicator)
+        ]
 
 # Define the scopes
 SCOPES = ['https://www.googleapis.com/auth/blogger']
 
 def main():
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from googleapiclient.discovery import build
+
     # Create the flow using the client secrets file
     flow = InstalledAppFlow.from_client_secrets_file(
         'path/to/your/client_secret.json', SCOPES)
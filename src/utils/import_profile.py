@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+MODULE = "src.agents.content_engine"
+BUDGET_SECONDS = float(os.getenv("IMPORT_BUDGET_SECONDS", "1.0"))
+HEAVY_MODULES = [
+    "transformers", "torch", "spacy", "sklearn", "matplotlib", "plotly",
+    "pytrends", "praw", "newsapi", "textblob", "google.generativeai"
+]
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def import_profile(module: str = MODULE) -> Tuple[float, List[str]]:
+    """Import module in a fresh interpreter with -X importtime.
+
+    Returns (seconds, heavy modules imported along the way).
+    """
+    probe = (
+        "import sys\n"
+        f"import {module}\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+    # Lines look like "import time: self [us] | cumulative | imported package"
+    cumulative = None
+    for line in result.stderr.splitlines():
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            cumulative = int(parts[1])
+    if cumulative is None:
+        raise RuntimeError(f"{module} missing from -X importtime output")
+    heavy = [name for name in result.stdout.strip().split(",") if name]
+    return cumulative / 1e6, heavy
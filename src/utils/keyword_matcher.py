@@ -0,0 +1,107 @@
+from typing import Dict, Iterable, List, Tuple
+from collections import deque
+from functools import lru_cache
+import logging
+
+logger = logging.getLogger(__name__)
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over a fixed keyword set.
+
+    Built once per keyword set, it finds every keyword (including
+    overlapping ones) in a single left-to-right pass over the text.
+    Matching is case-insensitive, and with whole_words=True a match must
+    not start or end inside a word.
+    """
+
+    def __init__(self, keywords: Iterable[str], whole_words: bool = True):
+        self.whole_words = whole_words
+        self.keywords: List[str] = []
+        # Trie stored as parallel lists indexed by state; state 0 is the root
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for keyword in dict.fromkeys(keywords):
+            pattern = keyword.lower()
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(len(self.keywords))
+            self.keywords.append(keyword)
+        self._lengths = [len(keyword.lower()) for keyword in self.keywords]
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                # Inherit the matches of the longest proper suffix
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str):
+        """Yield (start, keyword index) for every match in text order of match end"""
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Keep offsets aligned with text when lowering changes lengths
+            lowered = "".join(char.lower()[0] for char in text)
+        goto, fail, out, lengths = self._goto, self._fail, self._out, self._lengths
+        state = 0
+        for end, char in enumerate(lowered, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in out[state]:
+                start = end - lengths[index]
+                if self.whole_words and not self._on_boundaries(lowered, start, end):
+                    continue
+                yield start, index
+
+    @staticmethod
+    def _on_boundaries(text: str, start: int, end: int) -> bool:
+        before = text[start - 1] if start > 0 else " "
+        after = text[end] if end < len(text) else " "
+        return not (before.isalnum() or before == "_") and not (after.isalnum() or after == "_")
+
+    def find_all(self, text: str) -> Dict[str, List[int]]:
+        """Start offsets of every keyword in text (empty lists for misses)"""
+        positions: Dict[str, List[int]] = {keyword: [] for keyword in self.keywords}
+        for start, index in self.iter_matches(text):
+            positions[self.keywords[index]].append(start)
+        for offsets in positions.values():
+            offsets.sort()
+        return positions
+
+    def count(self, text: str) -> Dict[str, int]:
+        counts = dict.fromkeys(self.keywords, 0)
+        for _, index in self.iter_matches(text):
+            counts[self.keywords[index]] += 1
+        return counts
+
+    def search(self, text: str) -> bool:
+        """True as soon as any keyword matches"""
+        return next(self.iter_matches(text), None) is not None
+
+@lru_cache(maxsize=128)
+def _cached_matcher(keywords: Tuple[str, ...], whole_words: bool) -> KeywordMatcher:
+    return KeywordMatcher(keywords, whole_words)
+
+def get_keyword_matcher(keywords: Iterable[str], whole_words: bool = True) -> KeywordMatcher:
+    """Return a shared matcher for a keyword set, building it on first use"""
+    return _cached_matcher(tuple(keywords), whole_words)
@@ -0,0 +1,128 @@
+from typing import Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import logging
+import re
+import threading
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# One scan classifies every token: markdown headers, words and sentence ends
+TOKEN_PATTERN = re.compile(
+    r"(?P<header>^[ \t]*#{1,6}\s)|(?P<word>\w+(?:'\w+)*)|(?P<end>[.!?]+)",
+    re.MULTILINE
+)
+VOWELS = np.array([ord(c) for c in "aeiouy"], dtype=np.uint32)
+E = ord("e")
+
+@dataclass
+class TextStats:
+    """Counts for one document, computed from a single tokenization"""
+    word_count: int
+    sentence_count: int
+    syllable_count: int
+    header_count: int
+    flesch_reading_ease: float
+
+def count_syllables(words: np.ndarray) -> np.ndarray:
+    """Vectorized syllable estimate for an array of lowercased words.
+
+    Counts vowel groups, drops a trailing silent e and never returns less
+    than one syllable per word.
+    """
+    if len(words) == 0:
+        return np.zeros(0, dtype=np.int64)
+    lengths = np.char.str_len(words)
+    codes = np.frombuffer("".join(words.tolist()).encode("utf-32-le"), dtype=np.uint32)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+    vowel = np.isin(codes, VOWELS)
+    previous = np.concatenate(([False], vowel[:-1]))
+    previous[starts] = False  # vowel groups never continue across words
+    groups = np.add.reduceat((vowel & ~previous).astype(np.int64), starts)
+
+    groups -= codes[starts + lengths - 1] == E
+    return np.maximum(groups, 1)
+
+def flesch_reading_ease(words: int, sentences: int, syllables: int) -> float:
+    if sentences == 0 or words == 0:
+        return 0.0
+    return 206.835 - 1.015 * (words / sentences) - 84.6 * (syllables / words)
+
+class TextAnalyzer:
+    """Memoized document statistics keyed by content hash.
+
+    Each document is tokenized once; word, sentence, syllable and header
+    counts and the Flesch score are computed from the resulting arrays.
+    Keyword densities are SEOAgent's job (see KeywordMatcher).
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, TextStats]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def analyze(self, content: str) -> TextStats:
+        key = hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.stats["hits"] += 1
+                return cached
+            self.stats["misses"] += 1
+
+        result = self._compute(content)
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return result
+
+    def _compute(self, content: str) -> TextStats:
+        words = []
+        sentences = 0
+        headers = 0
+        words_since_end = 0
+        for match in TOKEN_PATTERN.finditer(content):
+            kind = match.lastgroup
+            if kind == "word":
+                words.append(match.group().lower())
+                words_since_end += 1
+            elif kind == "end":
+                if words_since_end:
+                    sentences += 1
+                words_since_end = 0
+            else:
+                # A header line also closes any unterminated sentence before it
+                headers += 1
+                if words_since_end:
+                    sentences += 1
+                words_since_end = 0
+        if words_since_end:
+            sentences += 1  # trailing sentence without punctuation
+
+        word_array = np.array(words, dtype=str)
+        syllables = int(count_syllables(word_array).sum())
+        return TextStats(
+            word_count=len(words),
+            sentence_count=sentences,
+            syllable_count=syllables,
+            header_count=headers,
+            flesch_reading_ease=flesch_reading_ease(len(words), sentences, syllables)
+        )
+
+_analyzer: Optional[TextAnalyzer] = None
+
+def get_text_analyzer() -> TextAnalyzer:
+    """Return the process-wide text analyzer"""
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = TextAnalyzer()
+    return _analyzer
+
+def analyze_text(content: str) -> TextStats:
+    return get_text_analyzer().analyze(content)
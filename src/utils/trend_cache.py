@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+class TrendCache:
+    """Per-keyword TTL cache that serves stale results while refreshing them.
+
+    Entries younger than ttl are served as is. Entries younger than
+    stale_ttl are served immediately and refreshed in the background;
+    older entries are refetched before returning. Concurrent misses for
+    the same key share one fetch.
+    """
+
+    def __init__(self, ttl: float = 15 * 60, stale_ttl: float = 6 * 3600,
+                 max_entries: int = 1024):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self._refreshes: Set[asyncio.Task] = set()
+        self.stats = {"fresh_hits": 0, "stale_hits": 0, "misses": 0,
+                      "refreshes": 0, "refresh_failures": 0}
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Cached value for key; fetch() is awaited on a miss and used to refresh"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            fetched_at, value = entry
+            age = time.monotonic() - fetched_at
+            if age < self.ttl:
+                self._entries.move_to_end(key)
+                self.stats["fresh_hits"] += 1
+                return value
+            if age < self.stale_ttl:
+                self._entries.move_to_end(key)
+                self.stats["stale_hits"] += 1
+                self._refresh(key, fetch)
+                return value
+
+        self.stats["misses"] += 1
+        return await asyncio.shield(self._fetch(key, fetch))
+
+    def _fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self._in_flight.get(key)
+        # A task left behind by a closed event loop can never finish
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._store(key, fetch))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._fetch_done(key, done))
+        return task
+
+    def _fetch_done(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    async def _store(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        value = await fetch()
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def _refresh(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]):
+        task = self._in_flight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            return
+        self.stats["refreshes"] += 1
+        task = self._fetch(key, fetch)
+        # Keep a reference so the refresh is not garbage collected mid-flight
+        self._refreshes.add(task)
+        task.add_done_callback(self._refresh_done)
+
+    def _refresh_done(self, task: asyncio.Task):
+        self._refreshes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            # The stale value stays until stale_ttl; the next hit retries
+            self.stats["refresh_failures"] += 1
+            logger.warning(f"Trend refresh failed: {task.exception()!r}")
+
+_trend_cache: Optional[TrendCache] = None
+
+def get_trend_cache() -> TrendCache:
+    """Return the process-wide trend cache"""
+    global _trend_cache
+    if _trend_cache is None:
+        _trend_cache = TrendCache()
+    return _trend_cache
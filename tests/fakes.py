@@ -0,0 +1,36 @@
+import asyncio
+from typing import Dict, List, Optional
+from src.models.base_model import BaseModel
+
+class FakeModel(BaseModel):
+    """Scriptable model for tests.
+
+    Answers "<name>: <prompt>" after delay seconds, or raises error when
+    set (only on the first fail_times calls if given). Records every call
+    and every call that was cancelled.
+    """
+
+    provider = "fake"
+
+    def __init__(self, name: str = "fake", delay: float = 0.0,
+                 error: Optional[Exception] = None, fail_times: Optional[int] = None,
+                 responses: Optional[Dict[str, str]] = None):
+        super().__init__(name)
+        self.delay = delay
+        self.error = error
+        self.fail_times = fail_times
+        self.responses = dict(responses or {})
+        self.calls: List[str] = []
+        self.cancelled = 0
+
+    async def complete(self, prompt: str, **params) -> str:
+        self.calls.append(prompt)
+        call = len(self.calls)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error is not None and (self.fail_times is None or call <= self.fail_times):
+            raise self.error
+        return self.responses.get(prompt, f"{self.model_name}: {prompt}")
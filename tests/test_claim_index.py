@@ -0,0 +1,60 @@
+import pytest
+
+pytest.importorskip("sklearn")
+pytest.importorskip("scipy")
+
+from src.utils.claim_index import ClaimIndex
+
+CLAIMS = [
+    "The Eiffel Tower is 330 metres tall",
+    "Water boils at 100 degrees Celsius at sea level",
+    "The Great Wall of China is visible from space",
+]
+
+def make_index(tmp_path=None, **kwargs):
+    return ClaimIndex(str(tmp_path) if tmp_path else None, **kwargs)
+
+def test_lookup_respects_threshold():
+    index = make_index(threshold=0.85)
+    index.add(CLAIMS, ["true", "true", "false"])
+    reused = index.lookup([
+        "the eiffel tower is 330 metres tall.",
+        "The Eiffel Tower is in Paris",
+    ])
+    assert reused == {"the eiffel tower is 330 metres tall.": "true"}
+
+def test_pending_rows_and_merged_matrix_give_same_results():
+    pending = make_index(merge_every=1000)
+    merged = make_index(merge_every=1)
+    for index in (pending, merged):
+        for claim, verdict in zip(CLAIMS, ["a", "b", "c"]):
+            index.add([claim], [verdict])
+    assert pending._inverted is None and merged._pending == []
+
+    query = ["Water boils at 100 degrees Celsius", "The Great Wall is visible from space"]
+    for expected, actual in zip(pending.query(query, k=2), merged.query(query, k=2)):
+        assert [claim for claim, _, _ in expected] == [claim for claim, _, _ in actual]
+        assert [score for _, score, _ in expected] == pytest.approx([score for _, score, _ in actual])
+
+def test_expired_verdicts_are_not_reused():
+    index = make_index(max_age=60)
+    index.add(CLAIMS[:1], ["true"])
+    index.added_at[0] -= 120
+    index._added_array = None
+    assert index.lookup(CLAIMS[:1]) == {}
+
+    # Checking the claim again refreshes the stored verdict
+    index.add(CLAIMS[:1], ["false"])
+    assert index.lookup(CLAIMS[:1]) == {CLAIMS[0]: "false"}
+    assert len(index) == 1
+
+def test_close_persists_below_save_every(tmp_path):
+    index = make_index(tmp_path, save_every=1000)
+    index.add(CLAIMS, ["a", "b", "c"])
+    index.close()
+
+    reloaded = make_index(tmp_path)
+    assert reloaded.claims == CLAIMS
+    assert reloaded.verdicts == ["a", "b", "c"]
+    assert reloaded.added_at == index.added_at
+    assert reloaded.lookup([CLAIMS[1]]) == {CLAIMS[1]: "b"}
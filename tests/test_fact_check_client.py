@@ -0,0 +1,35 @@
+import asyncio
+from src.utils.fact_check_client import FactCheckClient, VerdictCache
+
+class ScriptedClient(FactCheckClient):
+    """Answers from a dict instead of HTTP; a claim mapped to an exception raises it"""
+
+    def __init__(self, answers, delays=None):
+        super().__init__({"source": "http://fact-check.invalid/"}, cache=VerdictCache())
+        self.answers = answers
+        self.delays = delays or {}
+
+    async def _query(self, source, url, claim):
+        await asyncio.sleep(self.delays.get(claim, 0))
+        answer = self.answers[claim]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+def test_duplicates_are_checked_once():
+    client = ScriptedClient({"Claim A": "true"})
+    results = asyncio.run(client.check(["Claim A", "claim  a"]))
+    assert results == {"Claim A": {"source": "true"}, "claim  a": {"source": "true"}}
+    assert client.stats["deduplicated"] == 1
+
+def test_unexpected_error_only_drops_its_claim():
+    client = ScriptedClient({"good": "true", "bad": RuntimeError("boom")})
+    results = asyncio.run(client.check(["good", "bad"]))
+    assert results == {"good": {"source": "true"}}
+    assert client.stats["failures"] == 1
+
+def test_deadline_reports_late_claims():
+    client = ScriptedClient({"fast": "true", "slow": "false"}, delays={"slow": 1.0})
+    results, late = asyncio.run(client.check_within(["fast", "slow"], deadline=0.2))
+    assert results == {"fast": {"source": "true"}}
+    assert late == ["slow"]
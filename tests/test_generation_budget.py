@@ -0,0 +1,32 @@
+import pytest
+from src.models.generation_budget import GenerationBudget, PromptTooLongError
+
+class WordTokenizer:
+    """One token per whitespace-separated word"""
+    eos_token_id = 0
+    model_max_length = 64
+
+    def encode(self, text, add_special_tokens=False):
+        return text.split()
+
+    def decode(self, ids, skip_special_tokens=False):
+        return " ".join(ids)
+
+def words(count):
+    return " ".join(f"w{i}" for i in range(count))
+
+def test_budget_follows_task_ratio():
+    budget = GenerationBudget()
+    prompt, planned = budget.plan(WordTokenizer(), None, words(20), "quiz")
+    assert prompt == words(20)
+    assert planned["max_new_tokens"] == 16  # 20 * 0.4 clamped up to min_new_tokens
+
+def test_rewrite_prompt_too_long_is_never_truncated():
+    budget = GenerationBudget()
+    with pytest.raises(PromptTooLongError):
+        budget.plan(WordTokenizer(), None, words(200), "tone")
+
+def test_truncation_only_when_allowed():
+    budget = GenerationBudget()
+    prompt, planned = budget.plan(WordTokenizer(), None, words(200), "quiz", truncate=True)
+    assert len(prompt.split()) + planned["max_new_tokens"] == 64
@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+from src.models.hedged_model import HedgedModel
+from tests.fakes import FakeModel
+
+def hedged(primary, backup, delay=0.05):
+    return HedgedModel(primary, backup, initial_delay=delay, min_delay=delay)
+
+def test_fast_primary_is_not_hedged():
+    primary, backup = FakeModel("primary"), FakeModel("backup")
+    model = hedged(primary, backup)
+    assert asyncio.run(model.complete("q")) == "primary: q"
+    assert backup.calls == []
+    assert model.stats["hedged"] == 0
+
+def test_slow_primary_loses_to_backup_and_is_cancelled():
+    primary, backup = FakeModel("primary", delay=1.0), FakeModel("backup")
+    model = hedged(primary, backup)
+    assert asyncio.run(model.complete("q")) == "backup: q"
+    assert primary.cancelled == 1
+    assert model.stats["backup_wins"] == 1
+
+def test_slow_backup_loses_to_primary_and_is_cancelled():
+    primary, backup = FakeModel("primary", delay=0.1), FakeModel("backup", delay=1.0)
+    model = hedged(primary, backup)
+    assert asyncio.run(model.complete("q")) == "primary: q"
+    assert backup.cancelled == 1
+    assert (model.stats["hedged"], model.stats["primary_wins"]) == (1, 1)
+
+def test_failed_primary_falls_through_to_backup():
+    primary = FakeModel("primary", error=ConnectionError("down"))
+    backup = FakeModel("backup")
+    assert asyncio.run(hedged(primary, backup).complete("q")) == "backup: q"
+
+def test_both_failing_raises():
+    primary = FakeModel("primary", error=ConnectionError("primary down"))
+    backup = FakeModel("backup", error=ConnectionError("backup down"))
+    model = hedged(primary, backup)
+    with pytest.raises(ConnectionError):
+        asyncio.run(model.complete("q"))
+    assert model.stats["failures"] == 1
+
+def test_cancelling_the_caller_cancels_both_calls():
+    primary, backup = FakeModel("primary", delay=1.0), FakeModel("backup", delay=1.0)
+
+    async def run():
+        call = asyncio.ensure_future(hedged(primary, backup).complete("q"))
+        await asyncio.sleep(0.1)
+        call.cancel()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert (primary.cancelled, backup.cancelled) == (1, 1)
@@ -0,0 +1,6 @@
+from src.utils.import_profile import BUDGET_SECONDS, MODULE, import_profile
+
+def test_content_engine_import_stays_light():
+    seconds, heavy = import_profile()
+    assert not heavy, f"Heavy modules imported eagerly: {heavy}"
+    assert seconds <= BUDGET_SECONDS, f"import {MODULE} took {seconds:.3f}s (budget {BUDGET_SECONDS:.3f}s)"
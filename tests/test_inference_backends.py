@@ -0,0 +1,22 @@
+import pytest
+from src.models.inference_backends import resolve_task_model
+
+pytest.importorskip("transformers")
+
+def test_default_model_is_resolved_from_the_task():
+    task, model = resolve_task_model("sentiment-analysis", None)
+    assert task == "text-classification"  # the alias is normalized
+    assert isinstance(model, str) and "/" in model
+
+def test_explicit_model_is_kept():
+    assert resolve_task_model("text-generation", "distilgpt2") == ("text-generation", "distilgpt2")
+
+@pytest.mark.parametrize("default", [
+    {"pt": ("org/model", "abc123"), "tf": ("org/tf-model", "abc123")},
+    ("org/model", "abc123"),
+])
+def test_both_default_layouts_are_supported(monkeypatch, default):
+    import transformers.pipelines
+    monkeypatch.setattr(transformers.pipelines, "check_task",
+                        lambda task: (task, {"default": {"model": default}}, None))
+    assert resolve_task_model("some-task", None) == ("some-task", "org/model")
@@ -0,0 +1,42 @@
+from src.models.map_reduce_summarizer import MapReduceSummarizer
+
+class FakeTokenizer:
+    model_max_length = 64
+
+    def encode(self, text, add_special_tokens=True):
+        return text.split()
+
+    def decode(self, ids):
+        return " ".join(ids)
+
+class FakeSummarizer:
+    """Keeps the first few words of each input and records every call"""
+
+    tokenizer = FakeTokenizer()
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, inputs, max_length, min_length, **kwargs):
+        batch = inputs if isinstance(inputs, list) else [inputs]
+        self.calls.append((len(batch), max_length))
+        return [{"summary_text": " ".join(text.split()[:5])} for text in batch]
+
+def article(paragraphs=8):
+    return "\n\n".join(" ".join(f"p{i}w{j}" for j in range(30)) for i in range(paragraphs))
+
+def test_lengths_share_one_map_pass():
+    pipeline = FakeSummarizer()
+    summarizer = MapReduceSummarizer(lambda: pipeline, batch_size=32)
+    summary, tldr = summarizer.summarize_lengths(article(), [(120, 40), (50, 20)])
+    assert pipeline.calls == [(8, summarizer.map_max_length), (1, 120), (1, 50)]
+    assert summary == tldr == "p0w0 p0w1 p0w2 p0w3 p0w4"
+
+def test_repeated_articles_hit_the_chunk_cache():
+    pipeline = FakeSummarizer()
+    summarizer = MapReduceSummarizer(lambda: pipeline)
+    summarizer.summarize(article(), 150, 50)
+    calls = len(pipeline.calls)
+    summarizer.summarize(article(), 150, 50)
+    assert len(pipeline.calls) == calls + 1  # only the reduce call
+    assert summarizer.stats["cached_chunks"] == summarizer.stats["chunks"] // 2
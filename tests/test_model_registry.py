@@ -0,0 +1,79 @@
+import gc
+import threading
+from src.models.model_registry import ModelRegistry, release_leases
+
+MB = 1024 * 1024
+
+def loader(name):
+    def load():
+        return name
+    return load
+
+def test_shared_lease_loads_once():
+    registry = ModelRegistry()
+    first = registry.lease("gpt2", "causal-lm", loader("gpt2"))
+    second = registry.lease("gpt2", "causal-lm", loader("gpt2"))
+    assert first.get() == second.get() == "gpt2"
+    assert registry.stats == {"loads": 1, "shared": 1, "evictions": 0}
+
+def test_unleased_models_are_evicted_first():
+    registry = ModelRegistry(memory_budget_mb=1)
+    kept = registry.lease("a", "task", loader("a"), size_hint=MB)
+    dropped = registry.lease("b", "task", loader("b"), size_hint=MB)
+    dropped.get()
+    dropped.release()
+    kept.get()
+    assert registry.stats["evictions"] == 1
+    assert registry._entries[dropped.key].value is None
+    assert registry._entries[kept.key].value == "a"
+
+def test_eviction_skips_entries_being_loaded():
+    registry = ModelRegistry(memory_budget_mb=1, idle_timeout=0.0)
+    loading = threading.Event()
+    resume = threading.Event()
+
+    def slow_load():
+        loading.set()
+        resume.wait(5)
+        return "slow"
+
+    slow = registry.lease("slow", "task", slow_load, size_hint=MB)
+    other = registry.lease("other", "task", loader("other"), size_hint=MB)
+    result = []
+    worker = threading.Thread(target=lambda: result.append(slow.get()))
+    worker.start()
+    loading.wait(5)
+    registry._entries[slow.key].size = MB  # as if the load had sized it already
+    registry._entries[slow.key].value = "partially loaded"
+    other.get()  # over budget, but the loading entry is locked
+    assert registry.stats["evictions"] == 0
+    resume.set()
+    worker.join(5)
+    assert result == ["slow"]
+    assert registry._entries[slow.key].value == "slow"
+
+def test_leases_are_released_explicitly_or_when_collected():
+    registry = ModelRegistry()
+
+    class Agent:
+        def __init__(self):
+            self._model = registry.lease("m", "task", loader("m"))
+
+    agent, dropped = Agent(), Agent()
+    assert registry._entries[("m", "task", "cpu")].refcount == 2
+    release_leases(agent)
+    assert agent._model.released
+    assert registry._entries[("m", "task", "cpu")].refcount == 1
+    del dropped
+    gc.collect()
+    assert registry._entries[("m", "task", "cpu")].refcount == 0
+
+def test_content_engine_releases_every_lease(monkeypatch):
+    import src.models.model_registry as model_registry
+    from src.agents.content_engine import ContentEngine
+    registry = ModelRegistry()
+    monkeypatch.setattr(model_registry, "_registry", registry)
+    engine = ContentEngine({})
+    assert registry._entries
+    engine.release_models()
+    assert {key: entry.refcount for key, entry in registry._entries.items() if entry.refcount} == {}
@@ -0,0 +1,22 @@
+import pytest
+from src.models import base_model
+from src.models.base_model import get_provider_pool
+
+@pytest.fixture(autouse=True)
+def empty_pools(monkeypatch):
+    monkeypatch.setattr(base_model, "_provider_pools", {})
+
+def test_same_key_shares_one_client():
+    first = get_provider_pool("fake", lambda limit: object(), api_key="key-a")
+    second = get_provider_pool("fake", lambda limit: object(), api_key="key-a")
+    assert first is second
+
+def test_different_keys_get_separate_clients():
+    first = get_provider_pool("fake", lambda limit: object(), api_key="key-a")
+    second = get_provider_pool("fake", lambda limit: object(), api_key="key-b")
+    assert first.client is not second.client
+
+def test_single_key_provider_rejects_a_second_key():
+    get_provider_pool("fake", lambda limit: object(), api_key="key-a", single_key=True)
+    with pytest.raises(ValueError):
+        get_provider_pool("fake", lambda limit: object(), api_key="key-b", single_key=True)
@@ -0,0 +1,29 @@
+import asyncio
+import os
+from src.models.replay_model import Cassette, RecordingModel
+from tests.fakes import FakeModel
+
+def test_recording_is_written_on_close(tmp_path):
+    path = str(tmp_path / "session.json.gz")
+
+    async def record():
+        recorder = RecordingModel(FakeModel(), Cassette(path), save_every=0)
+        await asyncio.gather(*(recorder.complete(f"prompt {i}") for i in range(5)))
+        assert not os.path.exists(path)
+        await recorder.close()
+
+    asyncio.run(record())
+    assert len(Cassette(path).entries) == 5
+
+def test_recording_saves_in_batches(tmp_path):
+    path = str(tmp_path / "session.json.gz")
+
+    async def record():
+        recorder = RecordingModel(FakeModel(), Cassette(path), save_every=3)
+        for i in range(4):
+            await recorder.complete(f"prompt {i}")
+        assert len(Cassette(path).entries) == 3
+        await recorder.close()
+
+    asyncio.run(record())
+    assert len(Cassette(path).entries) == 4
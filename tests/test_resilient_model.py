@@ -0,0 +1,63 @@
+import asyncio
+import itertools
+import pytest
+from src.models.resilient_model import CircuitBreaker, CircuitOpenError, ResilientModel
+from tests.fakes import FakeModel
+
+_names = itertools.count()
+
+def fake(**kwargs):
+    # Breakers are shared per model name, so every test gets fresh names
+    return FakeModel(f"fake-{next(_names)}", **kwargs)
+
+def resilient(model, **kwargs):
+    return ResilientModel(model, base_delay=0.0, **kwargs)
+
+def test_transient_errors_are_retried():
+    model = fake(error=ConnectionError("blip"), fail_times=2)
+    wrapper = resilient(model)
+    assert asyncio.run(wrapper.complete("q")) == f"{model.model_name}: q"
+    assert wrapper.stats["retries"] == 2
+    assert wrapper.breaker.state == CircuitBreaker.CLOSED
+
+def test_bad_requests_are_not_retried_or_counted():
+    model = fake(error=ValueError("bad prompt"))
+    wrapper = resilient(model)
+    with pytest.raises(ValueError):
+        asyncio.run(wrapper.complete("q"))
+    assert len(model.calls) == 1
+    assert wrapper.breaker.failures == 0
+
+def test_open_circuit_sends_requests_to_the_fallback():
+    model = fake(error=ConnectionError("down"))
+    fallback = fake()
+    wrapper = resilient(model, fallback=fallback, max_attempts=3, failure_threshold=3)
+    assert asyncio.run(wrapper.complete("q")) == f"{fallback.model_name}: q"
+    assert wrapper.breaker.state == CircuitBreaker.OPEN
+
+    # While open, the primary is not called at all
+    assert asyncio.run(wrapper.complete("q")) == f"{fallback.model_name}: q"
+    assert len(model.calls) == 3
+    assert wrapper.stats["rejected"] == 1
+
+def test_without_fallback_an_open_circuit_raises():
+    wrapper = resilient(fake(error=ConnectionError("down")), max_attempts=1, failure_threshold=1)
+    with pytest.raises(ConnectionError):
+        asyncio.run(wrapper.complete("q"))
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(wrapper.complete("q"))
+
+def test_half_open_allows_one_trial_call():
+    breaker = CircuitBreaker("trial", failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()  # the trial is still in flight
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
@@ -0,0 +1,57 @@
+import asyncio
+from src.models.response_cache import CachedModel, ResponseCache
+from tests.fakes import FakeModel
+
+def test_memory_tier_serves_repeats():
+    async def run():
+        cache = ResponseCache(path=None)
+        await cache.set("k", "v", ttl=60, elapsed=2.0)
+        return cache, await cache.get("k"), await cache.get("missing")
+
+    cache, hit, miss = asyncio.run(run())
+    assert (hit, miss) == ("v", None)
+    assert cache.stats["memory_hits"] == 1
+    assert cache.stats["misses"] == 1
+
+def test_disk_tier_is_shared_and_promoted_to_memory(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+
+    async def run():
+        await ResponseCache(path).set("k", "v", ttl=60)
+        other = ResponseCache(path)  # e.g. another worker process
+        first, second = await other.get("k"), await other.get("k")
+        return other, first, second
+
+    other, first, second = asyncio.run(run())
+    assert first == second == "v"
+    assert other.stats["disk_hits"] == 1
+    assert other.stats["memory_hits"] == 1
+
+def test_expired_entries_miss_in_both_tiers(tmp_path):
+    async def run():
+        cache = ResponseCache(str(tmp_path / "responses.sqlite3"))
+        await cache.set("k", "v", ttl=-1)
+        return await cache.get("k")
+
+    assert asyncio.run(run()) is None
+
+def test_memory_tier_evicts_least_recently_used():
+    async def run():
+        cache = ResponseCache(path=None, max_memory_entries=2)
+        await cache.set("a", "1", ttl=60)
+        await cache.set("b", "2", ttl=60)
+        await cache.get("a")
+        await cache.set("c", "3", ttl=60)
+        return [await cache.get(key) for key in ("a", "b", "c")]
+
+    assert asyncio.run(run()) == ["1", None, "3"]
+
+def test_cached_model_calls_the_provider_once():
+    async def run():
+        fake = FakeModel()
+        model = CachedModel(fake, ResponseCache(path=None))
+        return fake, [await model.complete("q") for _ in range(2)]
+
+    fake, results = asyncio.run(run())
+    assert results == ["fake: q", "fake: q"]
+    assert len(fake.calls) == 1
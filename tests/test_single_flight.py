@@ -0,0 +1,63 @@
+import asyncio
+from src.models.single_flight import CANCEL_NEVER, SingleFlightModel
+from tests.fakes import FakeModel
+
+def test_identical_requests_share_one_call():
+    async def run():
+        fake = FakeModel(delay=0.05)
+        model = SingleFlightModel(fake)
+        results = await asyncio.gather(*(model.complete("same") for _ in range(3)))
+        return fake, model, results
+
+    fake, model, results = asyncio.run(run())
+    assert results == ["fake: same"] * 3
+    assert len(fake.calls) == 1
+    assert model.stats["coalesced"] == 2
+    assert model.in_flight == 0
+
+def test_cancelled_waiter_does_not_cancel_the_others():
+    async def run():
+        fake = FakeModel(delay=0.1)
+        model = SingleFlightModel(fake)
+        leaving = asyncio.ensure_future(model.complete("same"))
+        staying = asyncio.ensure_future(model.complete("same"))
+        await asyncio.sleep(0.02)
+        leaving.cancel()
+        return fake, leaving, await staying
+
+    fake, leaving, result = asyncio.run(run())
+    assert leaving.cancelled()
+    assert result == "fake: same"
+    assert fake.cancelled == 0
+
+def test_abandoned_call_is_cancelled_and_not_reused():
+    async def run():
+        fake = FakeModel(delay=0.1)
+        model = SingleFlightModel(fake)
+        only = asyncio.ensure_future(model.complete("same"))
+        await asyncio.sleep(0.02)
+        only.cancel()
+        await asyncio.sleep(0)
+        assert model.in_flight == 0
+        fake.delay = 0
+        return fake, model, await model.complete("same")
+
+    fake, model, result = asyncio.run(run())
+    assert result == "fake: same"
+    assert fake.cancelled == 1
+    assert len(fake.calls) == 2
+    assert model.stats["abandoned"] == 1
+
+def test_never_policy_lets_the_call_finish():
+    async def run():
+        fake = FakeModel(delay=0.05)
+        model = SingleFlightModel(fake, cancel_policy=CANCEL_NEVER)
+        only = asyncio.ensure_future(model.complete("same"))
+        await asyncio.sleep(0.01)
+        only.cancel()
+        await asyncio.sleep(0.1)
+        return fake, model
+
+    fake, model = asyncio.run(run())
+    assert fake.cancelled == 0
+    assert model.in_flight == 0
@@ -0,0 +1,60 @@
+import pytest
+import asyncio
+from src.models.base_model import StreamChunk
+from src.models.structured_output import JSONScanner, OutputSchema, extract_json, read_json_stream
+
+@pytest.mark.parametrize("text, expected, repaired", [
+    ('{"a": 1}', {"a": 1}, False),
+    ('```json\n{"a": [1, 2]}\n```', {"a": [1, 2]}, False),
+    ('Sure! Here it is: {"a": 1} Hope that helps.', {"a": 1}, False),
+    ('{"a": [1, 2,], "b": 3,}', {"a": [1, 2], "b": 3}, True),
+    ("{'a': 'it is', 'b': True, 'c': None}", {"a": "it is", "b": True, "c": None}, True),
+    ("{'quote': 'say \"hi\"'}", {"quote": 'say "hi"'}, True),
+    ('{a: 1, b_2: "x"}', {"a": 1, "b_2": "x"}, True),
+    ('{“a”: “b”}', {"a": "b"}, False),
+])
+def test_extract_json_repairs_common_defects(text, expected, repaired):
+    assert extract_json(text) == (expected, repaired)
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"a": "cut off mid', {"a": "cut off mid"}),
+    ('{"a": [1, 2', {"a": [1, 2]}),
+    ('{"a": {"b": 1}, "c": ', {"a": {"b": 1}, "c": None}),
+    ('{"a": tru', {"a": True}),
+    ('{"a": Fals', {"a": False}),
+    ('{"a": nul', {"a": None}),
+    ('{"a": 1.', {"a": 1}),
+    ('{"a": -', {"a": None}),
+    ('{"a": "x", "b"', {"a": "x", "b": None}),
+])
+def test_extract_json_closes_truncated_output(text, expected):
+    assert extract_json(text) == (expected, True)
+
+@pytest.mark.parametrize("text", ["", "no json here", "{]"])
+def test_extract_json_gives_up_without_a_value(text):
+    assert extract_json(text) == (None, False)
+
+def test_brackets_in_prose_are_skipped():
+    assert extract_json('Keywords [SEO]:\n{"primary": ["ai"]}') == ({"primary": ["ai"]}, False)
+    text = 'Sources (see [1]):\n{"primary": ["ai"], "secondary": []}'
+    assert extract_json(text) == ([1], False)
+    assert extract_json(text, expected=dict) == ({"primary": ["ai"], "secondary": []}, False)
+    assert extract_json("[1, 2]", expected=dict) == (None, False)
+
+def test_stream_reads_past_values_of_the_wrong_type():
+    async def stream():
+        for index, text in enumerate(['See [1] ', 'and {"a":', ' 1} trailing']):
+            yield StreamChunk(text=text, index=index)
+
+    assert asyncio.run(read_json_stream(stream(), expected=dict)) == '{"a": 1}'
+
+def test_scanner_stops_at_the_end_of_the_first_value():
+    scanner = JSONScanner()
+    assert not scanner.feed('noise {"a": "}"')
+    assert scanner.feed(', "b": [1]} trailing {"c": 2}')
+    assert scanner.segment == '{"a": "}", "b": [1]}'
+
+def test_schema_applies_defaults_and_requires_fields():
+    schema = OutputSchema("keywords", {"primary": list, "secondary": list}, {"secondary": []})
+    assert schema.validate({"primary": "ai", "secondary": 3}) == {"primary": ["ai"], "secondary": []}
+    assert schema.validate({"secondary": []}) is None
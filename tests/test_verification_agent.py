@@ -0,0 +1,33 @@
+import asyncio
+from src.agents.verification_agent import VerificationAgent
+
+ARTICLE = {"body": "Acme Corp opened an office in Paris."}
+
+def agent_with_fake_check(config):
+    agent = VerificationAgent(config)
+    checked = []
+
+    async def verify_article(article, fact_check_level="standard"):
+        checked.append(article)
+        return {
+            "claims": ["Acme Corp", "Paris"],
+            "fact_check_results": {"Acme Corp": {"snopes": "true"}},
+            "unchecked_claims": [{"claim": "Paris", "salience": 0.5, "reason": "no_verdict"}],
+        }
+
+    agent.verify_article = verify_article
+    return agent, checked
+
+def test_live_fact_checking_is_off_by_default():
+    agent, checked = agent_with_fake_check({})
+    results = asyncio.run(agent.verify(ARTICLE))["verification_results"]
+    assert checked == []
+    assert results["fact_check_results"] == []
+
+def test_live_fact_checking_is_enabled_by_config():
+    agent, checked = agent_with_fake_check({"live_fact_check": True})
+    results = asyncio.run(agent.verify(ARTICLE, "thorough"))["verification_results"]
+    assert checked == [ARTICLE["body"]]
+    assert results["fact_check_results"] == [{"claim": "Acme Corp", "verdicts": {"snopes": "true"}}]
+    assert results["unchecked_claims"][0]["reason"] == "no_verdict"
+    assert results["verification_level"] == "thorough"